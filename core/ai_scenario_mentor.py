@@ -5,6 +5,7 @@ AI 情境學長 (AI Scenario Mentor)
 """
 
 from typing import Dict, List, Optional
+import importlib.util
 import os
 import sys
 
@@ -15,28 +16,24 @@ try:
 except ImportError:
     HAS_LOCAL_LLM = False
 
-try:
-    from stage1_theory.qwen_mentor_bot import QwenMentorBot
-    HAS_QWEN_LLM = True
-except ImportError:
-    HAS_QWEN_LLM = False
-
-try:
-    from stage1_theory.senior_mentor_bot import SeniorMentorBot
-    HAS_CLAUDE_API = True
-except ImportError:
-    HAS_CLAUDE_API = False
+# Qwen（torch + transformers）與 Claude API（anthropic）匯入要數秒／數百毫秒，
+# 這裡只確認套件已安裝，實際選用該引擎時才匯入
+HAS_QWEN_LLM = all(importlib.util.find_spec(name) is not None
+                   for name in ("torch", "transformers"))
+HAS_CLAUDE_API = importlib.util.find_spec("anthropic") is not None
 
 
 class AIScenarioMentor:
     """AI 情境學長 - 在故障處理過程中提供像學長般的自然引導"""
 
-    def __init__(self, use_ai: bool = True):
+    def __init__(self, use_ai: bool = True, backend: Optional["AIScenarioMentor"] = None):
         """
         初始化 AI 情境學長
 
         Args:
             use_ai: 是否使用 AI（如果為 False 或 AI 不可用，則使用模板回應）
+            backend: 已初始化的 AI 情境學長；提供時共用其 AI 引擎
+                     （不再載入模型），對話歷史與情境上下文各自獨立
         """
         self.use_ai = use_ai
         self.ai_bot = None
@@ -51,7 +48,12 @@ class AIScenarioMentor:
         # 對話歷史（用於保持上下文）
         self.conversation_history = []
 
-        if use_ai:
+        if backend is not None:
+            if backend.ai_bot is not None:
+                self.ai_bot = backend.ai_bot.fork()
+            self.use_ai = backend.use_ai
+            self.llm_mode = backend.llm_mode
+        elif use_ai:
             self._initialize_ai()
 
         print(f"[Init] AI 情境學長模式: {self.llm_mode}")
@@ -63,6 +65,7 @@ class AIScenarioMentor:
         if HAS_QWEN_LLM and os.getenv("USE_QWEN_LLM", "false").lower() == "true":
             try:
                 print("[Info] 正在載入 Qwen 2.5 模型（這可能需要幾分鐘）...")
+                from stage1_theory.qwen_mentor_bot import QwenMentorBot
                 qwen_bot = QwenMentorBot(auto_load=True)
                 if qwen_bot.is_available():
                     self.ai_bot = qwen_bot
@@ -90,6 +93,7 @@ class AIScenarioMentor:
         # 3. 嘗試 Claude API
         if HAS_CLAUDE_API and os.getenv("ANTHROPIC_API_KEY"):
             try:
+                from stage1_theory.senior_mentor_bot import SeniorMentorBot
                 self.ai_bot = SeniorMentorBot()
                 self.llm_mode = "claude"
                 print("[OK] 使用 Claude API")
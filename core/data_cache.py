@@ -0,0 +1,89 @@
+"""
+SECOM 資料快取
+同一程序內同一個資料集只解析一次，所有模組共用同一份 DataFrame；
+安裝 pyarrow 時另存 Feather 檔（與 CSV 同目錄），之後啟動直接載入，不必再解析 CSV
+"""
+
+import functools
+import os
+import threading
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pd.read_feather / DataFrame.to_feather 需要)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+_load_lock = threading.Lock()
+
+
+def _feather_path(csv_path: str) -> str:
+    """CSV 對應的 Feather 快取檔路徑"""
+    return csv_path + ".feather"
+
+
+def _read_feather_cache(csv_path: str):
+    """Feather 快取存在且比 CSV 新時載入，否則回傳 None"""
+    feather_path = _feather_path(csv_path)
+
+    try:
+        if os.stat(feather_path).st_mtime < os.stat(csv_path).st_mtime:
+            return None
+        return pd.read_feather(feather_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[Warning] Feather 快取讀取失敗，改讀 CSV: {e}")
+        return None
+
+
+def _write_feather_cache(df: pd.DataFrame, csv_path: str):
+    """寫入 Feather 快取（先寫暫存檔再更名，避免其他程序讀到寫一半的檔案）"""
+    feather_path = _feather_path(csv_path)
+    tmp_path = f"{feather_path}.{os.getpid()}.tmp"
+
+    try:
+        df.to_feather(tmp_path, compression="lz4")
+        os.replace(tmp_path, feather_path)
+    except Exception as e:
+        print(f"[Warning] Feather 快取寫入失敗: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_secom(csv_path: str) -> pd.DataFrame:
+    """載入 SECOM 資料（優先使用 Feather 快取）"""
+    if HAS_PYARROW:
+        df = _read_feather_cache(csv_path)
+        if df is not None:
+            return df
+
+    # memory_map：直接從映射的檔案內容解析，省去逐塊 read() 複製
+    df = pd.read_csv(csv_path, memory_map=True)
+
+    if HAS_PYARROW:
+        _write_feather_cache(df, csv_path)
+
+    return df
+
+
+def load_secom(secom_data_path: str) -> pd.DataFrame:
+    """
+    載入 SECOM 資料集（同一檔案只解析一次）
+
+    回傳的 DataFrame 由所有呼叫者共用，請勿就地修改；
+    需要修改時先 .copy()
+
+    Args:
+        secom_data_path: SECOM 資料集 CSV 路徑
+
+    Returns:
+        SECOM 資料
+    """
+    # 以絕對路徑為鍵，"../uci-secom.csv" 與其絕對路徑共用同一份資料；
+    # 加鎖避免背景預載與介面初始化同時解析同一個檔案
+    with _load_lock:
+        return _load_secom(os.path.abspath(secom_data_path))
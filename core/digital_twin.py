@@ -15,6 +15,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import threading
+from core.data_cache import load_secom
 
 
 @dataclass
@@ -31,6 +33,11 @@ class SensorSpec:
 class LithographyDigitalTwin:
     """曝光機數位孿生系統"""
 
+    # SECOM 資料與由其統計出的感測器規格皆為唯讀，同一路徑只解析一次，所有實例共用
+    # {secom_data_path: (df, sensor_cols, sensor_specs)}
+    _shared_data: Dict[str, tuple] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(self, secom_data_path: str):
         """
         初始化數位孿生系統
@@ -38,11 +45,18 @@ class LithographyDigitalTwin:
         Args:
             secom_data_path: SECOM 資料集路徑
         """
-        self.df = pd.read_csv(secom_data_path)
-        self.sensor_cols = [col for col in self.df.columns if col not in ['Time', 'Pass/Fail']]
+        with self._shared_lock:
+            shared = self._shared_data.get(secom_data_path)
+            if shared is None:
+                self.df = load_secom(secom_data_path)
+                self.sensor_cols = [col for col in self.df.columns if col not in ['Time', 'Pass/Fail']]
+
+                # 建立感測器規格
+                self.sensor_specs = self._build_sensor_specs()
 
-        # 建立感測器規格
-        self.sensor_specs = self._build_sensor_specs()
+                self._shared_data[secom_data_path] = (self.df, self.sensor_cols, self.sensor_specs)
+            else:
+                self.df, self.sensor_cols, self.sensor_specs = shared
 
         # 當前狀態
         self.current_state = {}
@@ -56,21 +70,36 @@ class LithographyDigitalTwin:
         # 初始化為正常狀態
         self._initialize_normal_state()
 
+    @classmethod
+    def preload(cls, secom_data_path: str):
+        """
+        預先載入 SECOM 資料（之後建立的實例直接共用，不再解析 CSV）
+
+        Args:
+            secom_data_path: SECOM 資料集路徑
+        """
+        cls(secom_data_path)
+
     def _build_sensor_specs(self) -> Dict[str, SensorSpec]:
         """建立感測器規格（基於真實資料統計）"""
         specs = {}
 
-        # 從資料中提取統計資訊
-        normal_data = self.df[self.df['Pass/Fail'] == -1]
+        # 從資料中提取統計資訊（所有感測器一次計算，NaN 自動略過）
+        normal_data = self.df.loc[self.df['Pass/Fail'] == -1, self.sensor_cols].to_numpy(dtype=float)
+        valid = ~np.isnan(normal_data)
+        counts = valid.sum(axis=0)
+        sums = np.where(valid, normal_data, 0.0).sum(axis=0)
 
-        for sensor_id in self.sensor_cols:
-            values = normal_data[sensor_id].dropna()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            squared = np.where(valid, normal_data - means, 0.0) ** 2
+            stds = np.sqrt(squared.sum(axis=0) / (counts - 1))  # 樣本標準差 (ddof=1)，與 pandas 相同
 
-            if len(values) == 0:
-                continue
+        counts, means, stds = counts.tolist(), means.tolist(), stds.tolist()
 
-            mean = values.mean()
-            std = values.std()
+        for sensor_id, count, mean, std in zip(self.sensor_cols, counts, means, stds):
+            if count == 0:
+                continue
 
             # 根據感測器 ID 分類（簡化版，可根據實際需求調整）
             category = self._categorize_sensor(sensor_id, mean, std)
@@ -136,6 +165,12 @@ class LithographyDigitalTwin:
         self.fault_type = None
         self.fault_sensors = []
 
+    def reset(self):
+        """重設為正常狀態並清除操作記錄（重複使用同一個實例，不必重新建立）"""
+        self.current_state = {}
+        self.operation_log = []
+        self._initialize_normal_state()
+
     def inject_fault(self, fault_scenario: str) -> Dict:
         """
         注入故障情境
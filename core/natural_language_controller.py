@@ -5,6 +5,7 @@
 """
 
 import re
+import functools
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
@@ -12,6 +13,10 @@ from datetime import datetime
 class NaturalLanguageController:
     """自然語言控制器 - 理解並執行學員的文字指令"""
 
+    # 解析結果快取（訓練時學員常重複同樣的指令；過長的輸入不快取）
+    PARSE_CACHE_SIZE = 1024
+    PARSE_CACHE_MAX_INPUT = 200
+
     def __init__(self):
         """初始化 NLU 引擎"""
 
@@ -168,6 +173,35 @@ class NaturalLanguageController:
             (r'擦(.+)', r'清潔\1'),
         ]
 
+        # 預先編譯口語轉換規則，避免每次解析都重新查找 regex 快取
+        self._compiled_colloquial = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in self.colloquial_patterns
+        ]
+
+        # 關鍵字 → 意圖索引（同一關鍵字可能屬於多個意圖，例如「觀察」）
+        self._keyword_intents = self._build_keyword_index()
+
+        # 每個實例各自的解析快取
+        self._parse_cached = functools.lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._parse)
+
+    def _build_keyword_index(self) -> Dict[str, Tuple[str, ...]]:
+        """建立關鍵字到意圖的對照表（關鍵字重複列出時保留重複，計分與逐一比對一致）"""
+        index = {}
+        for intent, config in self.intent_keywords.items():
+            for keyword in config["keywords"]:
+                index.setdefault(keyword, []).append(intent)
+        return {keyword: tuple(intents) for keyword, intents in index.items()}
+
+    def _match_keywords(self, text: str) -> set:
+        """
+        找出文字中出現的所有意圖關鍵字（每個不重複的關鍵字只比對一次）
+
+        約 120 個短關鍵字對一句輸入逐一子字串比對只需十餘微秒，
+        且解析結果另有快取，不需要 Aho-Corasick 之類的多關鍵字比對套件
+        """
+        return {keyword for keyword in self._keyword_intents if keyword in text}
+
     def parse_input(self, user_input: str) -> Dict:
         """
         解析學員輸入
@@ -189,9 +223,21 @@ class NaturalLanguageController:
         if not user_input:
             return self._create_result("unknown", None, {}, 0.0, user_input)
 
-        # 保存原始輸入
-        original_input = user_input
+        if len(user_input) <= self.PARSE_CACHE_MAX_INPUT:
+            intent, target, parameters, confidence = self._parse_cached(user_input)
+        else:
+            intent, target, parameters, confidence = self._parse(user_input)
+
+        # 使用原始輸入作為 raw_input（參數字典複製一份，避免呼叫端修改到快取內容）
+        return self._create_result(intent, target, dict(parameters), confidence, user_input)
+
+    def _parse(self, user_input: str) -> Tuple[str, Optional[str], Dict, float]:
+        """
+        解析已去除前後空白的輸入
 
+        Returns:
+            (intent, target, parameters, confidence)
+        """
         # 預處理：將口語化表達轉換為標準指令
         user_input = self._preprocess_colloquial(user_input)
 
@@ -204,8 +250,7 @@ class NaturalLanguageController:
         # 提取參數
         parameters = self._extract_parameters(user_input, intent, target)
 
-        # 使用原始輸入作為 raw_input
-        return self._create_result(intent, target, parameters, confidence, original_input)
+        return intent, target, parameters, confidence
 
     def _preprocess_colloquial(self, text: str) -> str:
         """
@@ -220,32 +265,25 @@ class NaturalLanguageController:
         processed = text
 
         # 應用口語轉換規則
-        for pattern, replacement in self.colloquial_patterns:
-            processed = re.sub(pattern, replacement, processed)
+        for pattern, replacement in self._compiled_colloquial:
+            processed = pattern.sub(replacement, processed)
 
         return processed
 
     def _identify_intent(self, text: str) -> Tuple[str, float]:
         """識別意圖"""
-        text_lower = text.lower()
-
-        # 計算每個意圖的匹配分數
+        # 計算每個意圖的匹配分數（每個命中的關鍵字各計 1 分）
         scores = {}
 
-        for intent, config in self.intent_keywords.items():
-            score = 0
-            for keyword in config["keywords"]:
-                if keyword in text:
-                    score += 1
-
-            if score > 0:
-                scores[intent] = score
+        for keyword in self._match_keywords(text):
+            for intent in self._keyword_intents[keyword]:
+                scores[intent] = scores.get(intent, 0) + 1
 
         if not scores:
             return "unknown", 0.0
 
-        # 找到最高分的意圖
-        best_intent = max(scores, key=scores.get)
+        # 找到最高分的意圖（同分時依 intent_keywords 定義順序）
+        best_intent = max(self.intent_keywords, key=lambda intent: scores.get(intent, 0))
         max_score = scores[best_intent]
 
         # 計算信心度
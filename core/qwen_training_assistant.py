@@ -4,6 +4,7 @@ Qwen 2.5 訓練助手整合模組
 整合您原有的 Qwen 2.5 3B Instruct LLM 系統到半導體訓練平台
 """
 
+import threading
 import torch
 import time
 from typing import Dict, Optional
@@ -16,6 +17,9 @@ class QwenTrainingAssistant:
     整合到半導體設備故障處理訓練系統
     """
 
+    # 對話歷史最多保留的訊息數（10 輪；多位學員共用同一個助手時也不會無限增長）
+    MAX_HISTORY_MESSAGES = 20
+
     def __init__(self, model_name: str = "Qwen/Qwen2.5-3B-Instruct", use_quantization: bool = True):
         """
         初始化 Qwen 訓練助手
@@ -42,6 +46,10 @@ class QwenTrainingAssistant:
         # 對話歷史
         self.conversation_history = []
 
+        # 多位學員共用同一個模型時依序生成，避免同時生成耗盡 GPU 記憶體；
+        # 統計與對話歷史的更新也在此鎖內進行
+        self._generate_lock = threading.Lock()
+
         print(f"[Init] Qwen 訓練助手")
         print(f"  - 模型: {model_name}")
         print(f"  - 設備: {self.device}")
@@ -144,7 +152,7 @@ class QwenTrainingAssistant:
         # 生成
         start_time = time.time()
 
-        with torch.no_grad():
+        with self._generate_lock, torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
                 max_new_tokens=max_length,
@@ -165,24 +173,27 @@ class QwenTrainingAssistant:
         tokens_generated = len(generated_ids)
         tokens_per_sec = tokens_generated / gen_time if gen_time > 0 else 0
 
-        self.stats['answers_given'] += 1
-        self.stats['total_tokens_generated'] += tokens_generated
+        with self._generate_lock:
+            self.stats['answers_given'] += 1
+            self.stats['total_tokens_generated'] += tokens_generated
 
-        # 更新平均響應時間
-        total_answers = self.stats['answers_given']
-        self.stats['average_response_time'] = (
-            (self.stats['average_response_time'] * (total_answers - 1) + gen_time) / total_answers
-        )
+            # 更新平均響應時間
+            total_answers = self.stats['answers_given']
+            self.stats['average_response_time'] = (
+                (self.stats['average_response_time'] * (total_answers - 1) + gen_time) / total_answers
+            )
 
-        # 加入對話歷史
-        self.conversation_history.append({
-            'role': 'user',
-            'content': question
-        })
-        self.conversation_history.append({
-            'role': 'assistant',
-            'content': answer.strip()
-        })
+            # 加入對話歷史（只供記錄，生成回答時不帶入）
+            self.conversation_history.append({
+                'role': 'user',
+                'content': question
+            })
+            self.conversation_history.append({
+                'role': 'assistant',
+                'content': answer.strip()
+            })
+            if len(self.conversation_history) > self.MAX_HISTORY_MESSAGES:
+                self.conversation_history = self.conversation_history[-self.MAX_HISTORY_MESSAGES:]
 
         return {
             'answer': answer.strip(),
@@ -273,7 +284,7 @@ class QwenTrainingAssistant:
         if self.device == "cuda":
             inputs = inputs.to("cuda")
 
-        with torch.no_grad():
+        with self._generate_lock, torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
                 max_new_tokens=100,
@@ -288,7 +299,8 @@ class QwenTrainingAssistant:
             skip_special_tokens=True
         ).strip()
 
-        self.stats['questions_asked'] += 1
+        with self._generate_lock:
+            self.stats['questions_asked'] += 1
 
         return follow_up
 
@@ -329,7 +341,7 @@ class QwenTrainingAssistant:
         if self.device == "cuda":
             inputs = inputs.to("cuda")
 
-        with torch.no_grad():
+        with self._generate_lock, torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
                 max_new_tokens=150,
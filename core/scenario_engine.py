@@ -8,13 +8,41 @@
 - ProcessParameterDB: 製程參數資料庫
 """
 
-import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 from datetime import datetime, timedelta
 import random
 from core.simulated_sensors import LithographyEquipmentSensors
 from core.process_database import ProcessParameterDB
+from core.data_cache import load_secom
+
+
+class SimState(NamedTuple):
+    """
+    儀表板／設備圖顯示用的狀態快照（屬性存取，不再逐次以字串鍵查字典）
+
+    使用 NamedTuple：不帶 __dict__、欄位有預設值，且支援 Python 3.8
+    （dataclass(slots=True) 需要 3.10）
+    """
+    lens_temp: float = 23.0
+    cooling_flow: float = 5.0
+    vacuum_pressure: float = 1e-6
+    light_intensity: float = 100.0
+    alignment_error_x: float = 0.0
+    alignment_error_y: float = 0.0
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "SimState":
+        """由狀態字典建立快照，缺少的欄位使用預設值"""
+        get = state.get
+        return cls(
+            lens_temp=get("lens_temp", 23.0),
+            cooling_flow=get("cooling_flow", 5.0),
+            vacuum_pressure=get("vacuum_pressure", 1e-6),
+            light_intensity=get("light_intensity", 100.0),
+            alignment_error_x=get("alignment_error_x", 0.0),
+            alignment_error_y=get("alignment_error_y", 0.0),
+        )
 
 
 class ScenarioEngine:
@@ -30,7 +58,7 @@ class ScenarioEngine:
         print("[Init] Scenario engine...")
 
         # 載入 SECOM 資料
-        self.df = pd.read_csv(secom_data_path)
+        self.df = load_secom(secom_data_path)
         self.sensor_cols = [col for col in self.df.columns
                            if col not in ['Time', 'Pass/Fail']]
 
@@ -56,6 +84,7 @@ class ScenarioEngine:
         self.scenario_start_time = None
         self.progression_stage = 0
         self.time_elapsed = 0  # 秒
+        self._stage_times = ()  # 各階段觸發時間（秒），於初始化情境時預先取出
 
         print("[OK] Scenario engine ready!")
 
@@ -359,6 +388,9 @@ class ScenarioEngine:
         self.scenario_start_time = datetime.now()
         self.progression_stage = 0
         self.time_elapsed = 0
+        self._stage_times = tuple(
+            stage["time"] for stage in self.current_scenario["progression"]
+        )
 
         # 重置所有感測器到正常狀態
         self.sensors.clear_all_faults()
@@ -445,14 +477,13 @@ class ScenarioEngine:
         """
         self.time_elapsed += time_delta
 
-        # 檢查是否進入下一階段
-        progression = self.current_scenario["progression"]
+        # 檢查是否進入下一階段（只比對預先取出的觸發時間，未達門檻時不碰情境字典）
         next_stage = self.progression_stage + 1
 
-        if next_stage < len(progression):
-            stage_info = progression[next_stage]
+        if next_stage < len(self._stage_times):
+            if self.time_elapsed >= self._stage_times[next_stage]:
+                stage_info = self.current_scenario["progression"][next_stage]
 
-            if self.time_elapsed >= stage_info["time"]:
                 # 進入下一階段
                 self.progression_stage = next_stage
 
@@ -19,6 +19,7 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import time
+from core.data_cache import load_secom
 
 
 @dataclass
@@ -75,7 +76,7 @@ class SECOMRealtimeGenerator:
         """載入 SECOM 數據並計算統計特性"""
         try:
             # 讀取 SECOM 數據
-            df = pd.read_csv(self.secom_path)
+            df = load_secom(self.secom_path)
 
             # 為每個模擬參數計算統計量
             for sim_param, secom_col in self.mapping.items():
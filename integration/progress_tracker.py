@@ -5,11 +5,47 @@
 """
 
 from typing import Dict, List, Optional
+from collections import deque
 from datetime import datetime
+import atexit
 import json
+import threading
+import time
+import weakref
 from pathlib import Path
 import pandas as pd
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps_line(record: Dict) -> str:
+    """互動記錄 → JSONL 行（有 orjson 時使用 C 實作的編碼器）"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(
+                record,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+            ).decode('utf-8')
+        except TypeError:
+            pass  # orjson 不支援的型別交給標準 json 處理
+
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def _loads_line(line: str) -> Dict:
+    """JSONL 行 → 互動記錄"""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass  # 例如舊紀錄中的 NaN，交給標準 json 處理
+
+    return json.loads(line)
+
 
 class InteractionType:
     """互動類型"""
@@ -43,8 +79,19 @@ class ProgressTracker:
     # 生成報告
     report = tracker.generate_learning_report()
     ```
+
+    互動記錄先暫存在記憶體，累積 FLUSH_BATCH_SIZE 筆或暫存超過
+    FLUSH_INTERVAL 秒時才一次寫入檔案（學員之後沒有再操作也會由計時器寫入）；
+    讀取互動記錄前、同一學員建立新的追蹤器前以及程式結束時都會先寫入。
+    暫存區與統計資料以 _flush_lock 保護，背景產生報告時寫入也不會遺漏記錄。
     """
 
+    FLUSH_BATCH_SIZE = 10  # 累積筆數達此值即寫入
+    FLUSH_INTERVAL = 2.0  # 距上次寫入超過此秒數即寫入
+
+    # 所有存活中的追蹤器（程式結束時統一寫入）
+    _live: "weakref.WeakSet[ProgressTracker]" = weakref.WeakSet()
+
     def __init__(self, student_id: str, data_dir: str = "data/student_progress"):
         """
         初始化進度追蹤器
@@ -60,9 +107,26 @@ class ProgressTracker:
         # 互動記錄檔案
         self.interaction_file = self.data_dir / f"{student_id}_interactions.jsonl"
 
+        # 同一學員其他追蹤器尚未寫入的記錄先寫入，再載入統計
+        for other in list(ProgressTracker._live):
+            if other.interaction_file == self.interaction_file:
+                other.flush()
+
+        # 待寫入的互動記錄（JSONL 行）
+        self._pending: deque = deque()
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        ProgressTracker._live.add(self)
+
         # 統計資料
         self.stats = self._load_statistics()
 
+        # 知識盲點分析結果快取（記錄理論問答或實作操作後失效）
+        self._knowledge_gaps: Optional[List[Dict]] = None
+        # 每次記錄理論問答或實作操作就加一；分析期間有新紀錄時不寫入快取
+        self._gaps_generation = 0
+
     def _load_statistics(self) -> Dict:
         """載入統計資料"""
         stats_file = self.data_dir / f"{self.student_id}_stats.json"
@@ -113,12 +177,20 @@ class ProgressTracker:
             "score": score
         }
 
-        # 寫入 JSONL 檔案（每行一個 JSON）
-        with open(self.interaction_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(interaction, ensure_ascii=False) + '\n')
+        # 暫存 JSONL 行（每行一個 JSON），批次寫入；
+        # flush 可能同時在報告執行緒中進行，暫存與統計更新都在鎖內完成
+        line = _dumps_line(interaction)
+        with self._flush_lock:
+            self._pending.append(line)
+            self._update_statistics(interaction_type, success, score)
+            self._schedule_flush()
 
-        # 更新統計
-        self._update_statistics(interaction_type, success, score)
+            if interaction_type in (InteractionType.THEORY_QUESTION,
+                                    InteractionType.PRACTICE_OPERATION):
+                self._knowledge_gaps = None
+                self._gaps_generation += 1
+
+        self._maybe_flush()
 
     def _update_statistics(self, interaction_type: str,
                           success: Optional[bool], score: Optional[float]):
@@ -141,7 +213,40 @@ class ProgressTracker:
         elif interaction_type == InteractionType.EXPERT_CONSULT:
             self.stats["expert_consults"] += 1
 
-        self._save_statistics()
+    def _maybe_flush(self):
+        """累積筆數或間隔時間達門檻時寫入"""
+        if (len(self._pending) >= self.FLUSH_BATCH_SIZE or
+                time.monotonic() - self._last_flush > self.FLUSH_INTERVAL):
+            self.flush()
+
+    def _schedule_flush(self):
+        """暫存區有記錄時排定 FLUSH_INTERVAL 秒後寫入（呼叫時需持有 _flush_lock）"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _timed_flush(self):
+        """計時器到期：寫入閒置學員最後幾筆暫存記錄"""
+        with self._flush_lock:
+            self._flush_timer = None
+        self.flush()
+
+    def flush(self):
+        """將暫存的互動記錄與統計資料寫入檔案"""
+        with self._flush_lock:
+            if not self._pending:
+                return
+
+            # 整個暫存區一次換成新的，join 期間不會有記錄被加入或清掉
+            pending, self._pending = self._pending, deque()
+            lines = "".join(pending)
+
+            with open(self.interaction_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+            self._save_statistics()
+            self._last_flush = time.monotonic()
 
     def get_all_interactions(self) -> List[Dict]:
         """
@@ -150,13 +255,15 @@ class ProgressTracker:
         Returns:
             互動記錄列表
         """
+        self.flush()
+
         if not self.interaction_file.exists():
             return []
 
         interactions = []
         with open(self.interaction_file, 'r', encoding='utf-8') as f:
             for line in f:
-                interactions.append(json.loads(line))
+                interactions.append(_loads_line(line))
 
         return interactions
 
@@ -230,6 +337,23 @@ class ProgressTracker:
                 "accuracy": float  # 正確率
             }
         """
+        with self._flush_lock:
+            gaps = self._knowledge_gaps
+            generation = self._gaps_generation
+
+        if gaps is None:
+            # 分析會讀檔（並先 flush），在鎖外進行；報告執行緒分析期間若有新紀錄，
+            # 世代已改變，結果只用於這次回傳，不寫入快取
+            gaps = self._analyze_knowledge_gaps()
+            with self._flush_lock:
+                if self._gaps_generation == generation:
+                    self._knowledge_gaps = gaps
+
+        # 回傳複本，呼叫端修改不影響快取
+        return [dict(gap) for gap in gaps]
+
+    def _analyze_knowledge_gaps(self) -> List[Dict]:
+        """掃描全部互動記錄，統計各主題表現找出知識盲點"""
         interactions = self.get_all_interactions()
 
         # 統計各主題的表現
@@ -435,6 +559,13 @@ class ProgressTracker:
         return output_file
 
 
+@atexit.register
+def _flush_all_trackers():
+    """程式結束前寫入所有追蹤器尚未寫入的互動記錄"""
+    for tracker in list(ProgressTracker._live):
+        tracker.flush()
+
+
 # 使用範例
 if __name__ == "__main__":
     print("=== Progress Tracker 使用範例 ===\n")
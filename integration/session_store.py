@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+工作階段存放區 (Session Store)
+保存學員工作階段（以學員 ID 為鍵，同一學員的分頁共用），閒置逾時自動釋放
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import time
+
+
+class SessionStore:
+    """
+    學員工作階段存放區
+
+    職責：
+    1. 以工作階段鍵保存學員的執行期狀態（協調器、追蹤器、階段 2 模組）
+    2. 每次存取更新最後使用時間，閒置超過 idle_ttl 秒即釋放
+    3. 已釋放的工作階段在下次存取時以 factory 依學員 ID 重建
+
+    協調器與追蹤器本身已將進度寫入 data/student_progress，
+    因此釋放記憶體不會遺失學習紀錄，重建後即恢復進度。
+
+    使用範例：
+    ```python
+    store = SessionStore(factory=lambda student_id: {"student_id": student_id})
+
+    store.open("S001", "S001")             # 建立新的工作階段（取代同一鍵的舊工作階段）
+    session = store.touch("S001", "S001")  # 登入與各事件處理：取得（必要時重建）工作階段
+    ```
+    """
+
+    DEFAULT_IDLE_TTL = 15 * 60  # 閒置 15 分鐘釋放
+    SWEEP_INTERVAL = 60  # 最多每分鐘清理一次
+
+    def __init__(self, factory: Callable[[str], Dict], idle_ttl: float = DEFAULT_IDLE_TTL,
+                 on_evict: Optional[Callable[[Dict], None]] = None):
+        """
+        初始化工作階段存放區
+
+        Args:
+            factory: 依學員 ID 建立工作階段狀態的函式
+            idle_ttl: 閒置多久（秒）後釋放
+            on_evict: 工作階段釋放前呼叫（例如寫入尚未儲存的紀錄）
+        """
+        self._factory = factory
+        self.idle_ttl = idle_ttl
+        self._on_evict = on_evict
+
+        # {session_key: (last_access, state)}
+        self._sessions: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def open(self, session_key: str, student_id: str) -> Dict:
+        """
+        建立（或重設）工作階段
+
+        同一鍵已有工作階段時，先對舊的工作階段呼叫 on_evict（寫入暫存紀錄）再取代
+
+        Args:
+            session_key: 工作階段鍵
+            student_id: 學員 ID
+
+        Returns:
+            新的工作階段狀態
+        """
+        state = self._factory(student_id)
+        now = time.monotonic()
+
+        with self._lock:
+            replaced = self._sessions.get(session_key)
+            self._sessions[session_key] = (now, state)
+
+        if replaced is not None:
+            self._release([replaced[1]])
+
+        self._sweep(now)
+        return state
+
+    def touch(self, session_key: str, student_id: str) -> Optional[Dict]:
+        """
+        取得工作階段並更新最後使用時間（已釋放則重建）
+
+        Args:
+            session_key: 工作階段鍵
+            student_id: 學員 ID
+
+        Returns:
+            工作階段狀態，未登入時為 None
+        """
+        if not session_key or not student_id:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_key)
+            if entry is not None:
+                state = entry[1]
+                self._sessions[session_key] = (now, state)
+
+        if entry is None:
+            # 在鎖外重建（會讀取學員進度檔），避免阻塞其他學員
+            state = self._factory(student_id)
+            with self._lock:
+                state = self._sessions.setdefault(session_key, (now, state))[1]
+
+        self._sweep(now)
+        return state
+
+    def evict_idle(self) -> int:
+        """
+        釋放所有閒置逾時的工作階段
+
+        Returns:
+            釋放的數量
+        """
+        deadline = time.monotonic() - self.idle_ttl
+
+        with self._lock:
+            expired = [key for key, (last_access, _) in self._sessions.items()
+                       if last_access < deadline]
+            states = [self._sessions.pop(key)[1] for key in expired]
+
+        self._release(states)
+        return len(expired)
+
+    def _release(self, states):
+        """對釋放的工作階段呼叫 on_evict"""
+        if self._on_evict:
+            for state in states:
+                try:
+                    self._on_evict(state)
+                except Exception as e:
+                    print(f"[Warning] 工作階段釋放處理失敗: {e}")
+
+    def _sweep(self, now: float):
+        """距上次清理超過 SWEEP_INTERVAL 才清理，一般存取不需掃描全部工作階段"""
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        self.evict_idle()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
@@ -6,16 +6,25 @@ ASML 官方剖面圖設備視覺化器
 - 異常時該區域面板亮紅燈閃爍
 """
 
-from typing import Dict
+from typing import Dict, Tuple
+from collections import OrderedDict
 import base64
+import threading
 from pathlib import Path
 
 
 class ASMLCutawayVisualizer:
     """ASML 剖面圖視覺化生成器"""
 
+    # 設備視圖快取上限（狀態未變時直接回傳同一份 HTML）
+    VIEW_CACHE_SIZE = 16
+
     def __init__(self):
         """初始化視覺化器"""
+        # 已渲染視圖快取：顯示鍵 → HTML（LRU）
+        self._view_cache = OrderedDict()
+        self._view_cache_lock = threading.Lock()  # 多個工作階段共用同一個視覺化器
+
         # 載入 ASML 官方剖面圖
         self.equipment_image = self._load_image_as_base64("interface/images/asml_cutaway.png")
 
@@ -114,7 +123,47 @@ class ASMLCutawayVisualizer:
         }
 
     def generate_equipment_view(self, state: Dict, selected_component: str = None) -> str:
-        """生成設備視覺化"""
+        """生成設備視覺化（依顯示鍵快取，狀態未變時不重新組裝 HTML）"""
+        key = (self._view_key(state), selected_component)
+
+        with self._view_cache_lock:
+            html = self._view_cache.get(key)
+            if html is not None:
+                self._view_cache.move_to_end(key)
+                return html
+
+        html = self._render_equipment_view(state)
+
+        with self._view_cache_lock:
+            self._view_cache[key] = html
+            if len(self._view_cache) > self.VIEW_CACHE_SIZE:
+                self._view_cache.popitem(last=False)
+
+        return html
+
+    def _view_key(self, state: Dict) -> Tuple:
+        """
+        取出影響視圖輸出的欄位（顯示精度字串 + 門檻判斷結果）
+
+        兩個狀態的顯示鍵相同時，渲染出的 HTML 完全一致
+        """
+        lens_temp = state.get("lens_temp", 23.0)
+        cooling_flow = state.get("cooling_flow", 5.0)
+        light_intensity = state.get("light_intensity", 100)
+
+        return (
+            f"{lens_temp:.1f}", lens_temp > 26, lens_temp > 24,
+            f"{cooling_flow:.1f}", cooling_flow < 4.0, cooling_flow < 4.5,
+            f"{light_intensity:.0f}", light_intensity < 85, light_intensity < 92,
+            f"{state.get('vacuum_pressure', 1e-6):.0e}",
+            bool(state.get("stage_error", False)),
+            bool(state.get("reticle_error", False)),
+            bool(state.get("alignment_error", False)),
+            bool(state.get("handler_error", False)),
+        )
+
+    def _render_equipment_view(self, state: Dict) -> str:
+        """組裝設備視覺化 HTML"""
 
         # 計算各部件狀態
         component_status = self._calculate_all_status(state)
@@ -17,7 +17,9 @@ import types
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:  # 由啟動腳本匯入時根目錄已在路徑中
+    sys.path.insert(0, _PROJECT_ROOT)
 from interface.simulation_interface import SimulationTrainingSystem
 
 # ── 路徑 ─────────────────────────────────────────────────────────────────────
@@ -1681,18 +1683,22 @@ def start_game(secom_data_path: str, use_ai_mentor: bool = True,
 
 
 def create_firstperson_interface(secom_data_path: str,
-                                  use_ai_mentor: bool = True):
-    url = start_game(secom_data_path, use_ai_mentor)
+                                  use_ai_mentor: bool = True,
+                                  port: int = 8765):
+    # 遊戲伺服器在這裡就已啟動（127.0.0.1，port 被占用時往後找），
+    # url 為實際綁定的網址；launch() 只開啟瀏覽器並等待 Ctrl+C
+    url = start_game(secom_data_path, use_ai_mentor, port=port)
 
     class _FakeDemo:
         def launch(self, **kwargs):
             import webbrowser
             print(f"\n[GAME] Opening: {url}")
             webbrowser.open(url)
-            print("Press Ctrl+C to stop.\n")
             try:
                 threading.Event().wait()
             except KeyboardInterrupt:
-                pass
+                print("\n[BYE] 訓練系統已關閉。")
 
-    return _FakeDemo()
+    demo = _FakeDemo()
+    demo.url = url
+    return demo
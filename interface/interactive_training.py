@@ -11,7 +11,9 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import random
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:  # 由啟動腳本匯入時根目錄已在路徑中
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from core.digital_twin import LithographyDigitalTwin
 from core.scenario_generator import ScenarioGenerator
@@ -7,13 +7,20 @@
 import gradio as gr
 from typing import Dict, List, Tuple
 from datetime import datetime
+import functools
+import re
+import threading
+import numpy as np
+from string import Template
 import sys
 from pathlib import Path
 
 # 添加父目錄到路徑
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:  # 由啟動腳本匯入時根目錄已在路徑中
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from core.scenario_engine import ScenarioEngine
+from core.scenario_engine import ScenarioEngine, SimState
 from core.natural_language_controller import NaturalLanguageController, ActionExecutor
 from core.ai_expert_advisor import AIExpertAdvisor
 from core.ai_scenario_mentor import AIScenarioMentor
@@ -33,23 +40,158 @@ except Exception:
     HAS_3D_VIEWER = False
 
 
+# 多步驟輸入的分隔符：只以換行分隔
+# （分號常出現在一般句子中，如「溫度升高；該怎麼辦？」，不能拆成兩個步驟）
+_STEP_SEPARATOR = re.compile(r'\n+')
+
+
+def _split_steps(user_input: str) -> List[str]:
+    """將學員輸入拆成多個步驟（每行一個步驟，略過空行）"""
+    return [step for step in _STEP_SEPARATOR.split(user_input) if step.strip()]
+
+# 對話歷史與操作日誌的上限（定時器每秒回傳一次，避免長時間訓練後整包越來越大）
+_MAX_CONVERSATION_MESSAGES = 200
+_MAX_ACTION_LOG_CHARS = 8000
+
+# 儀表板參數定義：(名稱, 狀態鍵, 預設值, 單位, 最小, 最大, 正常下限, 正常上限, 科學記號顯示)
+_DASHBOARD_PARAMS = (
+    ("鏡頭溫度", "lens_temp", 23.0, "°C", 20, 30, 22, 24, False),
+    ("冷卻流量", "cooling_flow", 5.0, "L/min", 0, 10, 4.5, 5.5, False),
+    ("真空壓力", "vacuum_pressure", 1e-6, "Torr", 0, 1e-4, 5e-7, 2e-6, True),
+    ("光源強度", "light_intensity", 100, "%", 0, 120, 95, 105, False),
+    ("X軸誤差", "alignment_error_x", 0.0, "μm", 0, 0.5, 0, 0.05, False),
+    ("Y軸誤差", "alignment_error_y", 0.0, "μm", 0, 0.5, 0, 0.05, False),
+)
+
+
+def _dashboard_key(state: SimState) -> Tuple[Tuple[float, ...], Tuple[str, ...]]:
+    """
+    儀表板渲染快取的鍵：(顯示精度數值, 顏色)，順序同 _DASHBOARD_PARAMS
+
+    顏色以原始數值判斷，避免剛超出正常範圍的數值（如 24.004）
+    取到顯示精度後被誤判為正常
+    """
+    raw = (
+        state.lens_temp,
+        state.cooling_flow,
+        state.vacuum_pressure,
+        state.light_intensity,
+        state.alignment_error_x,
+        state.alignment_error_y,
+    )
+    values = (
+        round(raw[0], 2),
+        round(raw[1], 2),
+        float(f"{raw[2]:.2e}"),
+        round(raw[3], 2),
+        round(raw[4], 2),
+        round(raw[5], 2),
+    )
+    return values, tuple(_dashboard_colors(raw))
+
+
+# 儀表板 HTML 模板（匯入時編譯一次，渲染時只做代換）
+_DASHBOARD_HEADER = """
+        <div style="background: #f5f5f5; padding: 15px; border-radius: 10px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <h3 style="text-align: center; margin-top: 0; color: #333;">
+                即時參數監控
+            </h3>
+        """
+
+_DASHBOARD_ROW_T = Template("""
+            <div style="margin-bottom: 15px;">
+                <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                    <span style="font-weight: bold; color: #333;">$name</span>
+                    <span style="color: $color; font-weight: bold;">
+                        $value_display $unit
+                    </span>
+                </div>
+                <div style="background: #ddd; height: 20px; border-radius: 10px; overflow: hidden;">
+                    <div style="background: $color; height: 100%; width: $percentage%;
+                               transition: all 0.3s ease;"></div>
+                </div>
+            </div>
+            """)
+
+_DASHBOARD_FOOTER = """
+        </div>
+        """
+
+
+# 儀表板範圍（順序同 _DASHBOARD_PARAMS），一次比較六個參數
+_DASHBOARD_MIN = np.array([p[4] for p in _DASHBOARD_PARAMS], dtype=float)
+_DASHBOARD_MAX = np.array([p[5] for p in _DASHBOARD_PARAMS], dtype=float)
+_DASHBOARD_NORMAL_MIN = np.array([p[6] for p in _DASHBOARD_PARAMS], dtype=float)
+_DASHBOARD_NORMAL_MAX = np.array([p[7] for p in _DASHBOARD_PARAMS], dtype=float)
+
+# 0: 正常 / 1: 警告 / 2: 異常
+_DASHBOARD_PALETTE = ("#4caf50", "#ff9800", "#f44336")
+
+
+def _dashboard_colors(values: Tuple[float, ...]) -> List[str]:
+    """依正常／可接受範圍一次決定所有參數的儀表板顏色（傳入原始數值）"""
+    vals = np.fromiter(values, dtype=float, count=len(_DASHBOARD_PARAMS))
+    in_normal = (vals >= _DASHBOARD_NORMAL_MIN) & (vals <= _DASHBOARD_NORMAL_MAX)
+    in_range = (vals >= _DASHBOARD_MIN) & (vals <= _DASHBOARD_MAX)
+    color_idx = np.where(in_normal, 0, np.where(in_range, 1, 2))
+    return [_DASHBOARD_PALETTE[i] for i in color_idx.tolist()]
+
+
+def _dashboard_row(value, color, param) -> str:
+    """渲染單一參數列"""
+    name, _, _, unit, min_val, max_val, _, _, scientific = param
+
+    # 計算百分比（用於進度條）
+    percentage = (value - min_val) / (max_val - min_val) * 100
+    percentage = max(0, min(100, percentage))
+
+    return _DASHBOARD_ROW_T.substitute(
+        name=name,
+        color=color,
+        value_display=f"{value:.2e}" if scientific else f"{value:.2f}",
+        unit=unit,
+        percentage=percentage,
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _render_dashboard(values: Tuple[float, ...], colors: Tuple[str, ...]) -> str:
+    """渲染參數儀表板（輸入為顯示精度數值與顏色，相同時直接命中快取）"""
+    rows = "".join(
+        _dashboard_row(value, color, param)
+        for value, color, param in zip(values, colors, _DASHBOARD_PARAMS)
+    )
+    return _DASHBOARD_HEADER + rows + _DASHBOARD_FOOTER
+
+
 class SimulationTrainingSystem:
     """情境模擬訓練系統"""
 
-    def __init__(self, secom_data_path: str, use_ai_mentor: bool = True):
-        """初始化系統"""
+    def __init__(self, secom_data_path: str, use_ai_mentor: bool = True,
+                 mentor_backend: AIScenarioMentor = None,
+                 visualizer: ASMLCutawayVisualizer = None):
+        """
+        初始化系統
+
+        Args:
+            secom_data_path: SECOM 資料集路徑
+            use_ai_mentor: 是否使用 AI 情境學長
+            mentor_backend: 其他工作階段已建立的 AI 情境學長（共用其 LLM，不重新載入模型）
+            visualizer: 共用的設備視覺化器（None 則自行建立）
+        """
         print("[Init] Simulation training system...")
 
-        # 核心模組
-        self.scenario_engine = ScenarioEngine(secom_data_path)
-        self.digital_twin = LithographyDigitalTwin(secom_data_path)
-        self.nlu_controller = NaturalLanguageController()
-        self.action_executor = ActionExecutor(self.digital_twin)
+        # 同一工作階段的事件（學員輸入、定時演進）依序處理，避免同時修改情境與對話
+        self.event_lock = threading.Lock()
+
+        # 核心模組（延遲到第一次使用時才建立，避免啟動時就解析 SECOM 資料）
+        self.secom_data_path = secom_data_path
 
         # AI 系統：使用新的 AI 情境學長（優先）或舊的 AI 專家顧問
         self.use_ai_mentor = use_ai_mentor
         if use_ai_mentor:
-            self.ai_mentor = AIScenarioMentor(use_ai=True)
+            self.ai_mentor = AIScenarioMentor(use_ai=True, backend=mentor_backend)
             self.ai_advisor = None  # 不使用舊版
             print("[OK] 使用 AI 情境學長模式")
 
@@ -76,15 +218,11 @@ class SimulationTrainingSystem:
             print("[OK] 使用傳統專家顧問模式")
 
         # 設備視覺化器（使用 ASML 官方剖面圖）
-        self.equipment_visualizer = ASMLCutawayVisualizer()
-        print("[OK] ASML 剖面圖視覺化器已載入 (官方剖面圖 + 異常區域亮紅燈)")
-
-        # 閉環控制系統
-        self.closed_loop = ClosedLoopController(
-            sensors=self.scenario_engine.sensors,
-            process_db=self.scenario_engine.process_db
-        )
-        print("[OK] 閉環控制系統已載入")
+        if visualizer is not None:
+            self.equipment_visualizer = visualizer
+        else:
+            self.equipment_visualizer = ASMLCutawayVisualizer()
+            print("[OK] ASML 剖面圖視覺化器已載入 (官方剖面圖 + 異常區域亮紅燈)")
 
         # 系統狀態
         self.current_scenario = None
@@ -108,8 +246,49 @@ class SimulationTrainingSystem:
         self.pending_theory_context = None  # 待反問的理論上下文（延遲生成反問）
         self.scenario_completed = False  # 場景是否完成
 
+        # 多步驟輸入批次處理：批次中只記錄最新狀態，結束後渲染一次
+        self._batching = False
+        self._pending_render_state = None
+
         print("[OK] System ready!")
 
+    @functools.cached_property
+    def scenario_engine(self) -> ScenarioEngine:
+        """情境引擎（第一次開始情境時才載入 SECOM 資料）"""
+        return ScenarioEngine(self.secom_data_path)
+
+    @functools.cached_property
+    def digital_twin(self) -> LithographyDigitalTwin:
+        """數位孿生"""
+        return LithographyDigitalTwin(self.secom_data_path)
+
+    @functools.cached_property
+    def nlu_controller(self) -> NaturalLanguageController:
+        """自然語言控制器"""
+        return NaturalLanguageController()
+
+    @functools.cached_property
+    def action_executor(self) -> ActionExecutor:
+        """動作執行器"""
+        return ActionExecutor(self.digital_twin)
+
+    @functools.cached_property
+    def closed_loop(self) -> ClosedLoopController:
+        """閉環控制系統（依附情境引擎的感測器與製程資料庫）"""
+        controller = ClosedLoopController(
+            sensors=self.scenario_engine.sensors,
+            process_db=self.scenario_engine.process_db
+        )
+        print("[OK] 閉環控制系統已載入")
+        return controller
+
+    def close(self):
+        """結束此訓練階段（停止背景監控執行緒）"""
+        self.session_active = False
+        controller = self.__dict__.get("closed_loop")
+        if controller is not None and controller.is_monitoring:
+            controller.stop_monitoring()
+
     def start_new_scenario(self, difficulty: str = "medium") -> Tuple[str, str, str, list, str]:
         """
         開始新情境
@@ -212,6 +391,52 @@ class SimulationTrainingSystem:
         """
         處理學員輸入（智能模式切換）
 
+        一次輸入多個步驟（每行一個步驟）時依序執行，
+        設備圖與儀表板只在全部步驟完成後渲染一次
+
+        Returns:
+            (user_input_cleared, equipment_html, dashboard_html, equipment_status_html, conversation_history, action_log)
+        """
+        steps = _split_steps(user_input)
+
+        if len(steps) <= 1:
+            (user_input, equipment_html, dashboard_html, equipment_status_html,
+             conversation_history, action_log) = self._process_single_input(
+                user_input, equipment_html, dashboard_html,
+                equipment_status_html, conversation_history, action_log
+            )
+            return (user_input, equipment_html, dashboard_html, equipment_status_html,
+                    conversation_history, self._bound_history(action_log))
+
+        self._batching = True
+        self._pending_render_state = None
+        try:
+            for step in steps:
+                if not self.session_active:
+                    break
+                (_, equipment_html, dashboard_html, equipment_status_html,
+                 conversation_history, action_log) = self._process_single_input(
+                    step, equipment_html, dashboard_html,
+                    equipment_status_html, conversation_history, action_log
+                )
+        finally:
+            self._batching = False
+
+        if self._pending_render_state is not None:
+            equipment_html = self._generate_equipment_diagram(self._pending_render_state)
+            dashboard_html = self._generate_dashboard(self._pending_render_state)
+            self._pending_render_state = None
+
+        return ("", equipment_html, dashboard_html, equipment_status_html,
+                conversation_history, self._bound_history(action_log))
+
+    def _process_single_input(self, user_input: str, equipment_html: str,
+                              dashboard_html: str, equipment_status_html: str,
+                              conversation_history: list,
+                              action_log: str) -> Tuple[str, str, str, str, list, str]:
+        """
+        處理單一步驟的學員輸入
+
         Returns:
             (user_input_cleared, equipment_html, dashboard_html, equipment_status_html, conversation_history, action_log)
         """
@@ -345,8 +570,9 @@ class SimulationTrainingSystem:
         # 6. 更新顯示
         new_state = self.scenario_engine.get_current_state()
 
-        equipment_html = self._generate_equipment_diagram(new_state)
-        dashboard_html = self._generate_dashboard(new_state)
+        equipment_html, dashboard_html = self._render_displays(
+            new_state, equipment_html, dashboard_html
+        )
 
         # 7. 特殊處理：如果是檢查動作，顯示檢查結果
         if parsed_input["intent"] == "check":
@@ -995,116 +1221,50 @@ class SimulationTrainingSystem:
             # 更新日誌
             timestamp = now.strftime("%H:%M:%S")
             action_log += f"\n[{timestamp}] [系統] 故障持續演進..."
+            action_log = self._bound_history(action_log)
 
         self.last_update_time = now
 
         return equipment_html, dashboard_html, equipment_status_html, self.conversation_history, action_log
 
-    def _generate_equipment_diagram(self, state: Dict) -> str:
-        """生成設備視覺化圖（使用互動式視覺化器）"""
-        return self.equipment_visualizer.generate_equipment_view(state, self.selected_component)
-
-    def _generate_dashboard(self, state: Dict) -> str:
-        """生成參數儀表板"""
-
-        def get_color(value, min_val, max_val, normal_min, normal_max):
-            if normal_min <= value <= normal_max:
-                return "#4caf50"
-            elif min_val <= value <= max_val:
-                return "#ff9800"
-            else:
-                return "#f44336"
-
-        # 參數定義
-        params = [
-            {
-                "name": "鏡頭溫度",
-                "value": state.get("lens_temp", 23.0),
-                "unit": "°C",
-                "min": 20, "max": 30,
-                "normal_min": 22, "normal_max": 24
-            },
-            {
-                "name": "冷卻流量",
-                "value": state.get("cooling_flow", 5.0),
-                "unit": "L/min",
-                "min": 0, "max": 10,
-                "normal_min": 4.5, "normal_max": 5.5
-            },
-            {
-                "name": "真空壓力",
-                "value": state.get("vacuum_pressure", 1e-6),
-                "unit": "Torr",
-                "min": 0, "max": 1e-4,
-                "normal_min": 5e-7, "normal_max": 2e-6,
-                "scientific": True
-            },
-            {
-                "name": "光源強度",
-                "value": state.get("light_intensity", 100),
-                "unit": "%",
-                "min": 0, "max": 120,
-                "normal_min": 95, "normal_max": 105
-            },
-            {
-                "name": "X軸誤差",
-                "value": state.get("alignment_error_x", 0.0),
-                "unit": "μm",
-                "min": 0, "max": 0.5,
-                "normal_min": 0, "normal_max": 0.05
-            },
-            {
-                "name": "Y軸誤差",
-                "value": state.get("alignment_error_y", 0.0),
-                "unit": "μm",
-                "min": 0, "max": 0.5,
-                "normal_min": 0, "normal_max": 0.05
-            }
-        ]
-
-        html = """
-        <div style="background: #f5f5f5; padding: 15px; border-radius: 10px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-            <h3 style="text-align: center; margin-top: 0; color: #333;">
-                即時參數監控
-            </h3>
+    def _bound_history(self, action_log: str) -> str:
         """
+        限制對話歷史與操作日誌長度（只保留最新內容）
 
-        for param in params:
-            value = param["value"]
-            color = get_color(value, param["min"], param["max"],
-                            param["normal_min"], param["normal_max"])
-
-            # 計算百分比（用於進度條）
-            percentage = (value - param["min"]) / (param["max"] - param["min"]) * 100
-            percentage = max(0, min(100, percentage))
+        對話歷史就地裁切（各處回傳的都是同一個 list）
 
-            # 格式化數值顯示
-            if param.get("scientific"):
-                value_display = f"{value:.2e}"
-            else:
-                value_display = f"{value:.2f}"
-
-            html += f"""
-            <div style="margin-bottom: 15px;">
-                <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                    <span style="font-weight: bold; color: #333;">{param['name']}</span>
-                    <span style="color: {color}; font-weight: bold;">
-                        {value_display} {param['unit']}
-                    </span>
-                </div>
-                <div style="background: #ddd; height: 20px; border-radius: 10px; overflow: hidden;">
-                    <div style="background: {color}; height: 100%; width: {percentage}%;
-                               transition: all 0.3s ease;"></div>
-                </div>
-            </div>
-            """
-
-        html += """
-        </div>
+        Returns:
+            裁切後的操作日誌
         """
+        overflow = len(self.conversation_history) - _MAX_CONVERSATION_MESSAGES
+        if overflow > 0:
+            del self.conversation_history[:overflow]
+
+        if len(action_log) > _MAX_ACTION_LOG_CHARS:
+            tail = action_log[-_MAX_ACTION_LOG_CHARS:]
+            # 從完整的一行開始，避免日誌開頭出現半行
+            newline = tail.find("\n")
+            action_log = tail[newline:] if newline >= 0 else tail
+        return action_log
+
+    def _render_displays(self, state: Dict, equipment_html: str,
+                         dashboard_html: str) -> Tuple[str, str]:
+        """更新設備圖與儀表板；批次處理多步驟輸入時延後到批次結束才渲染"""
+        if self._batching:
+            self._pending_render_state = state
+            return equipment_html, dashboard_html
+
+        return self._generate_equipment_diagram(state), self._generate_dashboard(state)
 
-        return html
+    def _generate_equipment_diagram(self, state: Dict) -> str:
+        """生成設備視覺化圖（使用互動式視覺化器）"""
+        return self.equipment_visualizer.generate_equipment_view(state, self.selected_component)
+
+    def _generate_dashboard(self, state) -> str:
+        """生成參數儀表板（數值取到顯示精度後查快取，未變化時回傳同一份 HTML）"""
+        if not isinstance(state, SimState):
+            state = SimState.from_state(state)
+        return _render_dashboard(*_dashboard_key(state))
 
     def _update_equipment_status(self, parsed_input: Dict, action_result: Dict, current_state: Dict):
         """更新設備狀態檢查結果"""
@@ -1297,7 +1457,39 @@ class SimulationTrainingSystem:
 def create_simulation_interface(secom_data_path: str, use_ai_mentor: bool = True):
     """建立情境模擬介面"""
 
-    system = SimulationTrainingSystem(secom_data_path, use_ai_mentor=use_ai_mentor)
+    # 每位學員（瀏覽器工作階段）各自一個訓練系統，情境、對話與計時互不干擾；
+    # LLM 模型與設備視覺化器只在第一個工作階段建立，之後的工作階段共用
+    sessions: Dict[str, SimulationTrainingSystem] = {}
+    sessions_lock = threading.Lock()
+    shared = {}
+
+    def get_system(request: gr.Request) -> SimulationTrainingSystem:
+        session_id = request.session_hash if request is not None else ""
+        with sessions_lock:
+            system = sessions.get(session_id)
+            if system is None:
+                system = SimulationTrainingSystem(
+                    secom_data_path, use_ai_mentor=use_ai_mentor,
+                    mentor_backend=shared.get("mentor"),
+                    visualizer=shared.get("visualizer"),
+                )
+                shared.setdefault("mentor", system.ai_mentor)
+                shared.setdefault("visualizer", system.equipment_visualizer)
+                sessions[session_id] = system
+        return system
+
+    def find_system(request: gr.Request):
+        """取得已建立的系統（不建立新的，分頁關閉後仍送達的定時事件不會重建系統）"""
+        session_id = request.session_hash if request is not None else ""
+        with sessions_lock:
+            return sessions.get(session_id)
+
+    def release_system(request: gr.Request):
+        session_id = request.session_hash if request is not None else ""
+        with sessions_lock:
+            system = sessions.pop(session_id, None)
+        if system is not None:
+            system.close()
 
     # GLB 3D 模型（base64 嵌入，無需 file serving，無 CORS 問題）
     import base64, html as _html
@@ -1360,8 +1552,9 @@ def create_simulation_interface(secom_data_path: str, use_ai_mentor: bool = True
                 dashboard_display = gr.HTML(label="參數監控")
                 equipment_status_display = gr.HTML(label="設備檢查")
 
-        # 內部用的設備圖（隱藏，供狀態機使用）
-        equipment_display = gr.HTML(visible=False)
+        # 內部用的設備圖（不顯示，供狀態機使用）
+        # 以 gr.State 保存在伺服器端，定時器每秒觸發時不必把整份 HTML 來回傳給瀏覽器
+        equipment_display = gr.State("")
 
         # 系統訊息區
         system_messages = gr.Chatbot(
@@ -1385,41 +1578,75 @@ def create_simulation_interface(secom_data_path: str, use_ai_mentor: bool = True
         action_log = gr.Textbox(
             label="操作日誌",
             lines=10,
-            interactive=False
+            interactive=False,
+            autoscroll=True
         )
 
         # 定時器（用於自動演進）
         timer = gr.Timer(value=1, active=False)  # 每1秒觸發一次（逐秒更新）
 
-        # 事件綁定
-        def start_scenario(difficulty):
-            eq, dash, eq_status, msg, log = system.start_new_scenario(difficulty)
+        # 事件綁定（不同工作階段的事件不需排隊；同一工作階段以 event_lock 依序處理）
+        def start_scenario(difficulty, request: gr.Request):
+            system = get_system(request)
+            with system.event_lock:
+                eq, dash, eq_status, msg, log = system.start_new_scenario(difficulty)
             return eq, dash, eq_status, msg, log, gr.Timer(active=True)
 
+        def process_input(user_input, equipment_html, dashboard_html,
+                          equipment_status_html, conversation_history, action_log,
+                          request: gr.Request):
+            system = get_system(request)
+            with system.event_lock:
+                return system.process_user_input(
+                    user_input, equipment_html, dashboard_html,
+                    equipment_status_html, conversation_history, action_log
+                )
+
+        def auto_progress(equipment_html, dashboard_html, equipment_status_html,
+                          conversation_history, action_log, request: gr.Request):
+            # 學員輸入仍在處理（例如等待 LLM 回答）時略過這次定時演進，下一秒再更新
+            system = find_system(request)
+            if system is None or not system.event_lock.acquire(blocking=False):
+                return (gr.update(),) * 5
+            try:
+                return system.auto_progress(
+                    equipment_html, dashboard_html, equipment_status_html,
+                    conversation_history, action_log
+                )
+            finally:
+                system.event_lock.release()
+
         start_btn.click(
             fn=start_scenario,
             inputs=[difficulty_dropdown],
-            outputs=[equipment_display, dashboard_display, equipment_status_display, system_messages, action_log, timer]
+            outputs=[equipment_display, dashboard_display, equipment_status_display, system_messages, action_log, timer],
+            concurrency_limit=None
         )
 
         submit_btn.click(
-            fn=system.process_user_input,
+            fn=process_input,
             inputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
-            outputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log]
+            outputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
+            concurrency_limit=None
         )
 
         user_input.submit(
-            fn=system.process_user_input,
+            fn=process_input,
             inputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
-            outputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log]
+            outputs=[user_input, equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
+            concurrency_limit=None
         )
 
         # 定時自動演進
         timer.tick(
-            fn=system.auto_progress,
+            fn=auto_progress,
             inputs=[equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
-            outputs=[equipment_display, dashboard_display, equipment_status_display, system_messages, action_log]
+            outputs=[equipment_display, dashboard_display, equipment_status_display, system_messages, action_log],
+            concurrency_limit=None
         )
 
+        # 關閉分頁時釋放該學員的系統
+        demo.unload(release_system)
+
 
     return demo
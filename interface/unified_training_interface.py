@@ -4,62 +4,293 @@
 整合理論學習和實作訓練的完整訓練系統
 """
 
-import gradio as gr
+import functools
+import numpy as np
 import sys
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Tuple, Optional
 
 # 添加父目錄到路徑
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:  # 由啟動腳本匯入時根目錄已在路徑中
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from integration.training_coordinator import TrainingCoordinator, TrainingStage
 from integration.progress_tracker import ProgressTracker, InteractionType
 from integration.smart_recommender import SmartRecommender
 from integration.evaluation_system import EvaluationSystem
-from stage1_theory.senior_mentor_bot import SeniorMentorBot
+from integration.session_store import SessionStore
 from stage1_theory.local_mentor_bot import LocalMentorBot
-from core.scenario_engine import ScenarioEngine
-from core.natural_language_controller import NaturalLanguageController, ActionExecutor
-from core.digital_twin import LithographyDigitalTwin
+from stage1_theory.semantic_answer_cache import SemanticAnswerCache
 import os
 
-# 3D 設備展示模組（選擇性載入）
-try:
-    from interface.equipment_viewer_3d import create_3d_viewer_tab
-    HAS_3D_VIEWER = True
-except Exception:
-    HAS_3D_VIEWER = False
+# Gradio 與階段 2 的核心模組（情境引擎、數位孿生、NLU）延遲到實際使用時才載入，
+# 只使用理論／報告功能（或離線分析）時不必付出匯入成本
+
+
+# 顏色常數（設備圖：正常／異常；儀表板：正常／警告／異常）
+_EQUIP_NORMAL = "#44ff44"
+_EQUIP_ALERT = "#ff4444"
+_GAUGE_OK = "#4caf50"
+_GAUGE_WARN = "#ff9800"
+_GAUGE_ERR = "#f44336"
+
+# 儀表板參數範圍 (最小, 最大, 正常下限, 正常上限)
+_LENS_RANGE = (20, 30, 22, 24)
+_COOLING_RANGE = (0, 10, 4.5, 5.5)
+_VACUUM_RANGE = (0, 1e-4, 5e-7, 2e-6)
+
+# 儀表板參數 (名稱, 狀態鍵, 預設值, 單位, 最小, 最大, 正常下限, 正常上限, 科學記號)
+_DASHBOARD_PARAMS = (
+    ("鏡頭溫度", "lens_temp", 23.0, "°C", *_LENS_RANGE, False),
+    ("冷卻流量", "cooling_flow", 5.0, "L/min", *_COOLING_RANGE, False),
+    ("真空壓力", "vacuum_pressure", 1e-6, "Torr", *_VACUUM_RANGE, True),
+)
+
+# 儀表板 HTML 片段（每個參數套用同一個列模板，最後一次 join）
+_DASHBOARD_HEADER = """
+        <div style="background: #f5f5f5; padding: 15px; border-radius: 10px;">
+            <h3 style="text-align: center; margin-top: 0;">即時參數監控</h3>
+        """
+
+_DASHBOARD_ROW = """
+            <div style="margin-bottom: 15px;">
+                <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                    <span style="font-weight: bold;">{name}</span>
+                    <span style="color: {color}; font-weight: bold;">{value_display} {unit}</span>
+                </div>
+                <div style="background: #ddd; height: 20px; border-radius: 10px; overflow: hidden;">
+                    <div style="background: {color}; height: 100%; width: {percentage}%;"></div>
+                </div>
+            </div>
+            """
+
+_DASHBOARD_FOOTER = "</div>"
+
+# 整張儀表板模板：名稱、單位（以及真空壓力固定的 50% 進度條）匯入時代換好，
+# 每次渲染只剩 {狀態鍵_color} {狀態鍵_value} {狀態鍵_pct} 待代換
+_DASHBOARD_TMPL = _DASHBOARD_HEADER + "".join(
+    _DASHBOARD_ROW.format(
+        name=name, unit=unit,
+        color=f"{{{key}_color}}", value_display=f"{{{key}_value}}",
+        percentage=50 if scientific else f"{{{key}_pct}}",
+    )
+    for name, key, _, unit, _, _, _, _, scientific in _DASHBOARD_PARAMS
+) + _DASHBOARD_FOOTER
+
+
+def _gauge_color(value, min_val, max_val, normal_min, normal_max) -> str:
+    """儀表板顏色：正常範圍內綠色、量測範圍內橘色、超出範圍紅色"""
+    if normal_min <= value <= normal_max:
+        return _GAUGE_OK
+    if min_val <= value <= max_val:
+        return _GAUGE_WARN
+    return _GAUGE_ERR
+
+
+def _display_key(state: dict) -> tuple:
+    """設備圖與儀表板實際顯示的內容（顏色判斷 + 顯示精度數值），相同時畫面不變"""
+    return (
+        state.get("lens_temp", 23) > 25,
+        state.get("cooling_flow", 5.0) < 4.0,
+        *(f"{state.get(key, default):.2e}" if scientific else f"{state.get(key, default):.2f}"
+          for _, key, default, _, _, _, _, _, scientific in _DASHBOARD_PARAMS),
+    )
+
+
+# 設備示意圖外框：建立介面時送出一次，鏡頭／冷卻的顏色綁定 CSS 變數
+_EQUIPMENT_SHELL_HTML = """
+        <div style="background: #1e3c72; padding: 20px; border-radius: 10px;">
+            <h3 style="color: white; text-align: center;">曝光機設備狀態</h3>
+            <svg width="100%" height="300" viewBox="0 0 400 300">
+                <!-- 鏡頭 -->
+                <rect x="150" y="20" width="100" height="60" style="fill: var(--equip-lens-color, #44ff44);" stroke="#333" stroke-width="2" rx="5"/>
+                <text x="200" y="55" text-anchor="middle" fill="white" font-size="14">鏡頭</text>
+
+                <!-- 冷卻系統 -->
+                <rect x="20" y="100" width="80" height="50" style="fill: var(--equip-cooling-color, #44ff44);" stroke="#333" stroke-width="2" rx="5"/>
+                <text x="60" y="130" text-anchor="middle" fill="white" font-size="12">冷卻</text>
+
+                <!-- 腔體 -->
+                <rect x="130" y="120" width="140" height="100" fill="#888" stroke="#333" stroke-width="3" rx="10"/>
+                <text x="200" y="175" text-anchor="middle" fill="white" font-size="14">真空腔體</text>
+
+                <!-- 晶圓 -->
+                <ellipse cx="200" cy="250" rx="40" ry="15" fill="#666" stroke="#333" stroke-width="2"/>
+                <text x="200" y="255" text-anchor="middle" fill="white" font-size="11">晶圓</text>
+            </svg>
+            <div style="text-align: center; color: white; margin-top: 10px;">
+                <span style="color: #44ff44;">● 正常</span>
+                <span style="margin-left: 20px; color: #ff4444;">● 異常</span>
+            </div>
+        </div>
+        """
+
+# 每次狀態更新只送出顏色變數（約 80 bytes），不重送整張 SVG
+_EQUIPMENT_COLORS_TMPL = "<style>:root{{--equip-lens-color:{lens_color};--equip-cooling-color:{cooling_color};}}</style>"
+
+# 只有兩個部件、各兩種顏色，匯入時就把四種組合代換好：(鏡頭過熱, 冷卻不足) → HTML
+_EQUIPMENT_COLORS_HTML = {
+    (lens_hot, cooling_low): _EQUIPMENT_COLORS_TMPL.format_map({
+        "lens_color": _EQUIP_ALERT if lens_hot else _EQUIP_NORMAL,
+        "cooling_color": _EQUIP_ALERT if cooling_low else _EQUIP_NORMAL,
+    })
+    for lens_hot in (False, True)
+    for cooling_low in (False, True)
+}
+
+
+# 階段狀態顯示所需欄位（可雜湊，作為渲染快取的鍵）
+_StageView = namedtuple("_StageView", "name status score pass_score completed locked lock_reason")
+
+
+def _stage_view(status: dict) -> _StageView:
+    """由協調器的階段狀態字典取出顯示欄位"""
+    return _StageView(
+        status['name'], status['status'], status['score'], status['pass_score'],
+        status['completed'], status['locked'], status.get('lock_reason'),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _render_progress_html(completion, theory_score, practice_score, practice_completed) -> str:
+    """渲染整體進度條 HTML（相同進度直接命中快取）"""
+    html = f"""
+    <div style="padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                border-radius: 10px; color: white;">
+        <h3 style="margin-top: 0;">整體訓練進度</h3>
+        <div style="background: rgba(255,255,255,0.3); height: 30px; border-radius: 15px;
+                   margin: 10px 0; overflow: hidden;">
+            <div style="background: #4caf50; height: 100%; width: {completion}%;
+                       transition: width 0.5s ease; display: flex; align-items: center;
+                       justify-content: center; font-weight: bold;">
+                {completion}%
+            </div>
+        </div>
+        <div style="display: flex; justify-content: space-between; margin-top: 10px;">
+            <span>理論: {theory_score}分</span>
+            <span>實作: {practice_score}分</span>
+            <span>{'✅ 可進入真機實習' if practice_completed else '繼續訓練...'}</span>
+        </div>
+    </div>
+    """
+    return html
+
+
+@functools.lru_cache(maxsize=256)
+def _render_stage_status_html(theory_status: _StageView, practice_status: _StageView) -> str:
+    """渲染兩個階段的狀態卡片 HTML（相同狀態直接命中快取）"""
+    html = f"""
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-top: 15px;">
+        <!-- 階段 1 -->
+        <div style="padding: 15px; background: {'#e8f5e9' if theory_status.completed else '#fff3e0'};
+                   border-radius: 10px; border-left: 4px solid {_GAUGE_OK if theory_status.completed else _GAUGE_WARN};">
+            <h4 style="margin-top: 0;">📚 {theory_status.name}</h4>
+            <p><strong>狀態:</strong> {theory_status.status}</p>
+            <p><strong>分數:</strong> {theory_status.score} / {theory_status.pass_score}</p>
+            <p><strong>進度:</strong> {'✅ 已完成' if theory_status.completed else '⏳ 進行中'}</p>
+        </div>
+
+        <!-- 階段 2 -->
+        <div style="padding: 15px; background: {'#e8f5e9' if practice_status.completed else ('#ffebee' if practice_status.locked else '#e3f2fd')};
+                   border-radius: 10px; border-left: 4px solid {_GAUGE_OK if practice_status.completed else (_GAUGE_ERR if practice_status.locked else '#2196f3')};">
+            <h4 style="margin-top: 0;">🛠️ {practice_status.name}</h4>
+            <p><strong>狀態:</strong> {practice_status.status}</p>
+            <p><strong>分數:</strong> {practice_status.score} / {practice_status.pass_score}</p>
+            <p><strong>進度:</strong> {'✅ 已完成' if practice_status.completed else ('🔒 已鎖定' if practice_status.locked else '⏳ 進行中')}</p>
+            {f"<p style='color: #f44336;'><strong>解鎖條件:</strong> {practice_status.lock_reason}</p>" if practice_status.locked else ""}
+        </div>
+    </div>
+    """
+    return html
+
+
+# 判斷是否觸發智能推薦時回看的實作操作次數
+_RECENT_RESULTS_SIZE = 5
+
+# Mock 理論測驗
+_TEST_QUESTION_COUNT = 10
+_TEST_TOPICS = ("CVD", "真空系統", "冷卻系統", "對準系統", "溫度控制", "壓力控制", "光學系統", "化學反應", "安全規範", "SOP")
+_TEST_DIFFICULTIES = ("easy", "medium", "hard")
+_TEST_RNG = np.random.default_rng()
+
+# 智能推薦訊息模板（依推薦數量產生，一般最多 3 則，匯入時先建好）
+def _recommendation_template(count: int) -> str:
+    """產生 count 則推薦的訊息模板，推薦內容以位置參數 {0}..{count-1} 代換"""
+    return "".join((
+        "\n\n", "="*50, "\n",
+        "💡 **智能推薦系統**\n\n",
+        "偵測到你在某些操作上遇到困難，建議複習以下主題：\n\n",
+        *(f"{i + 1}. {{{i}}}\n" for i in range(count)),
+        "\n你可以返回「理論學習」頁面複習這些主題。\n",
+        "="*50,
+    ))
+
+
+_REC_TEMPLATES = {count: _recommendation_template(count) for count in (1, 2, 3)}
+
+# 理論回答串流時每次送出的字數
+_ANSWER_CHUNK_SIZE = 20
+
+# Mock 理論問答 (關鍵字, 回答)，依序比對，第一個命中的關鍵字為準
+_THEORY_KEYWORDS = (
+    ("cvd", "CVD（Chemical Vapor Deposition，化學氣相沉積）是一種重要的薄膜沉積技術，通過化學反應在晶圓表面形成薄膜。\n\n主要類型包括：\n- PECVD（電漿增強CVD）\n- LPCVD（低壓CVD）\n- APCVD（常壓CVD）"),
+    ("真空", "真空系統是半導體製程的關鍵設備，主要功能包括：\n\n1. 提供無污染的製程環境\n2. 控制反應氣體的流動\n3. 確保薄膜品質\n\n真空度通常需要達到 10⁻⁶ Torr 以下。"),
+    ("溫度", "溫度控制對製程品質至關重要，影響因素包括：\n\n1. 反應速率\n2. 薄膜品質\n3. 設備壽命\n\n通常需要精確控制在 ±0.5°C 以內。"),
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def _match_theory(question_lower: str) -> Optional[str]:
+    """比對 Mock 理論問答關鍵字，未命中回傳 None"""
+    for keyword, answer in _THEORY_KEYWORDS:
+        if keyword in question_lower:
+            return answer
+    return None
 
 
 class UnifiedTrainingSystem:
     """統一訓練系統 - 整合階段1和階段2"""
 
-    def __init__(self, secom_data_path: str):
+    def __init__(self, secom_data_path: str,
+                 answer_cache: Optional[SemanticAnswerCache] = None):
         """
         初始化統一訓練系統
 
         Args:
             secom_data_path: SECOM 資料集路徑
+            answer_cache: 理論問答語意快取（None 則使用預設設定）
         """
         print("[Init] Unified Training System...")
 
         # SECOM 資料路徑
         self.secom_data_path = secom_data_path
 
-        # 當前學員
-        self.current_student_id = None
-        self.coordinator = None
-        self.tracker = None
+        # 背景預先載入數位孿生共用的 SECOM 資料，之後各學員的孿生實例直接共用
+        threading.Thread(target=self._preload_secom, daemon=True).start()
+
+        # 學員相關狀態（協調器、追蹤器、階段 2 模組）放在工作階段存放區，
+        # gr.State 只保存工作階段鍵與學員 ID；閒置 15 分鐘即釋放，下次操作時從進度檔重建
+        self.sessions = SessionStore(self._new_session, on_evict=self._close_session)
+
+        # 這裡只保留所有學員共用、唯讀的模組
 
         # 新增整合模組
         self.recommender = SmartRecommender()
         self.evaluator = EvaluationSystem()
 
         # 階段 1 模組（理論學習）- AI學長BOT
+        # 這裡只保留模型設定／API client，各學員在工作階段中使用 fork() 的副本，對話歷史互不影響
         self.mentor_bot = None
         self.use_ai_bot = False
         self.llm_mode = "mock"  # "claude", "local", "mock"
 
+        # AI 回答快取：相同問題直接回傳先前的回答（所有學員共用，只存不含對話上下文的回答）
+        self.answer_cache = answer_cache if answer_cache is not None else SemanticAnswerCache()
+
         # 優先順序：本地 LLM > Claude API > Mock
         # 1. 嘗試本地 LLM (Ollama)
         try:
@@ -76,6 +307,8 @@ class UnifiedTrainingSystem:
         # 2. 如果本地 LLM 不可用，嘗試 Claude API
         if not self.use_ai_bot and os.getenv("ANTHROPIC_API_KEY"):
             try:
+                # 只有設定 API key 時才匯入 anthropic SDK
+                from stage1_theory.senior_mentor_bot import SeniorMentorBot
                 self.mentor_bot = SeniorMentorBot()
                 self.use_ai_bot = True
                 self.llm_mode = "claude"
@@ -88,36 +321,114 @@ class UnifiedTrainingSystem:
             print("[Info] 使用 Mock 模式（無 AI 功能）")
             print("[Tip] 安裝 Ollama 即可使用本地 LLM: https://ollama.com/download")
 
-        # 階段 2 模組（實作訓練）
-        self.scenario_engine = None
-        self.digital_twin = None
-        self.nlu_controller = None
-        self.action_executor = None
+        print("[OK] System ready!")
 
-        # 階段 2 狀態
-        self.stage2_active = False
-        self.current_scenario_data = None  # 當前場景資料（用於評分）
+    def _preload_secom(self):
+        """預先載入 SECOM 資料（失敗時留待進入實作訓練再處理）"""
+        try:
+            from core.digital_twin import LithographyDigitalTwin
+            LithographyDigitalTwin.preload(self.secom_data_path)
+            print("[OK] SECOM 資料已預先載入")
+        except Exception as e:
+            print(f"[Warning] SECOM 資料預先載入失敗: {e}")
 
-        print("[OK] System ready!")
+    @functools.cached_property
+    def report_pool(self) -> ThreadPoolExecutor:
+        """學習報告的背景讀取（追蹤器統計與協調器進度彼此獨立，可同時進行；第一次產生報告時才建立）"""
+        return ThreadPoolExecutor(max_workers=4, thread_name_prefix="report")
+
+    @functools.cached_property
+    def nlu_controller(self):
+        """階段 2 自然語言解析（不含學員狀態，所有工作階段共用）"""
+        from core.natural_language_controller import NaturalLanguageController
+        return NaturalLanguageController()
 
-    def login_student(self, student_id: str, student_name: str) -> Tuple[str, str, str]:
+    @staticmethod
+    def _new_session(student_id: str) -> dict:
         """
-        學員登入
+        建立學員工作階段狀態（存放於工作階段存放區，同一學員的分頁共用）
+
+        Args:
+            student_id: 學員 ID
 
         Returns:
-            (welcome_message, progress_html, stage_status)
+            工作階段字典
         """
-        if not student_id.strip():
-            return "請輸入學員 ID", "", ""
+        tracker = ProgressTracker(student_id)
+
+        # 最近幾次實作操作結果 (success, operation, topic)，登入時從歷史紀錄載入一次
+        recent_results = deque(
+            (
+                (op.get("success", False), op["data"]["operation"], op["data"].get("topic", "unknown"))
+                for op in tracker.get_interactions_by_type(InteractionType.PRACTICE_OPERATION)
+            ),
+            maxlen=_RECENT_RESULTS_SIZE
+        )
+
+        return {
+            "student_id": student_id,
+            "coordinator": TrainingCoordinator(student_id),
+            "tracker": tracker,
+            "recent_results": recent_results,
+            "mentor_bot": None,  # 學員自己的 AI 學長 BOT（第一次提問時建立）
+            "login_view": None,  # 登入畫面快取 (進度指紋, (welcome, progress_html, stage_status))
+            # 階段 2 模組（進入實作訓練時才建立）
+            "scenario_engine": None,
+            "digital_twin": None,
+            "action_executor": None,
+            "stage2_active": False,
+            "current_scenario_data": None,  # 當前場景資料（用於評分）
+        }
+
+    @staticmethod
+    def _close_session(session: dict):
+        """工作階段釋放前寫入追蹤器暫存的互動記錄"""
+        session["tracker"].flush()
+
+    def _session(self, handle: dict) -> dict:
+        """
+        由 gr.State 的工作階段鍵取得學員工作階段（並更新最後使用時間）
+
+        Args:
+            handle: {"key": 工作階段鍵, "student_id": 學員 ID, "display_key": 此分頁上次送出的顯示內容}，
+                    未登入時為空字典
+
+        Returns:
+            工作階段字典，未登入時為空字典
+        """
+        return self.sessions.touch(handle.get("key"), handle.get("student_id")) or {}
 
-        self.current_student_id = student_id
+    def login_student(self, student_id: str, student_name: str,
+                      handle: dict) -> Tuple[str, str, str, dict]:
+        """
+        學員登入
 
-        # 初始化協調器和追蹤器
-        self.coordinator = TrainingCoordinator(student_id)
-        self.tracker = ProgressTracker(student_id)
+        Returns:
+            (welcome_message, progress_html, stage_status, handle)
+        """
+        if not student_id.strip():
+            return "請輸入學員 ID", "", "", handle
+
+        # 工作階段以學員 ID 為鍵：重新整理頁面或重複登入沿用同一個工作階段，
+        # 不會留下另一個帶著舊統計的追蹤器，之後再以較舊的數字覆寫進度檔
+        handle = {"key": student_id, "student_id": student_id}
+        session = self.sessions.touch(handle["key"], student_id)
+        coordinator = session["coordinator"]
+
+        # 重新整理頁面或重複登入時進度通常沒變，直接使用上次的畫面；
+        # 指紋取自工作階段中協調器目前的狀態，分數更新後自然不相符而重新產生。
+        # 畫面快取存在工作階段中，隨工作階段閒置釋放
+        fingerprint = (
+            student_name, coordinator.current_stage,
+            coordinator.theory_score, coordinator.practice_score,
+            coordinator.theory_completed, coordinator.practice_completed,
+        )
+        cached = session["login_view"]
+        if cached is not None and cached[0] == fingerprint:
+            return (*cached[1], handle)
 
         # 生成歡迎訊息
-        progress = self.coordinator.get_overall_progress()
+        progress = coordinator.get_overall_progress()
 
         welcome = f"""
 # 歡迎，{student_name or student_id}！
@@ -147,9 +458,10 @@ class UnifiedTrainingSystem:
         progress_html = self._generate_progress_html(progress)
 
         # 生成階段狀態
-        stage_status = self._generate_stage_status_html(progress)
+        stage_status = self._generate_stage_status_html(coordinator)
 
-        return welcome, progress_html, stage_status
+        session["login_view"] = (fingerprint, (welcome, progress_html, stage_status))
+        return welcome, progress_html, stage_status, handle
 
     def _get_stage_name(self, stage: str) -> str:
         """獲取階段名稱"""
@@ -162,172 +474,167 @@ class UnifiedTrainingSystem:
 
     def _generate_progress_html(self, progress: dict) -> str:
         """生成進度條 HTML"""
-        completion = progress['overall_completion']
-
-        html = f"""
-        <div style="padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    border-radius: 10px; color: white;">
-            <h3 style="margin-top: 0;">整體訓練進度</h3>
-            <div style="background: rgba(255,255,255,0.3); height: 30px; border-radius: 15px;
-                       margin: 10px 0; overflow: hidden;">
-                <div style="background: #4caf50; height: 100%; width: {completion}%;
-                           transition: width 0.5s ease; display: flex; align-items: center;
-                           justify-content: center; font-weight: bold;">
-                    {completion}%
-                </div>
-            </div>
-            <div style="display: flex; justify-content: space-between; margin-top: 10px;">
-                <span>理論: {progress['theory_score']}分</span>
-                <span>實作: {progress['practice_score']}分</span>
-                <span>{'✅ 可進入真機實習' if progress['practice_completed'] else '繼續訓練...'}</span>
-            </div>
-        </div>
-        """
-        return html
+        return _render_progress_html(
+            progress['overall_completion'],
+            progress['theory_score'],
+            progress['practice_score'],
+            progress['practice_completed'],
+        )
 
-    def _generate_stage_status_html(self, progress: dict) -> str:
+    def _generate_stage_status_html(self, coordinator: TrainingCoordinator) -> str:
         """生成階段狀態 HTML"""
-        theory_status = self.coordinator.get_stage_status(TrainingStage.THEORY)
-        practice_status = self.coordinator.get_stage_status(TrainingStage.PRACTICE)
-
-        html = f"""
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-top: 15px;">
-            <!-- 階段 1 -->
-            <div style="padding: 15px; background: {'#e8f5e9' if theory_status['completed'] else '#fff3e0'};
-                       border-radius: 10px; border-left: 4px solid {'#4caf50' if theory_status['completed'] else '#ff9800'};">
-                <h4 style="margin-top: 0;">📚 {theory_status['name']}</h4>
-                <p><strong>狀態:</strong> {theory_status['status']}</p>
-                <p><strong>分數:</strong> {theory_status['score']} / {theory_status['pass_score']}</p>
-                <p><strong>進度:</strong> {'✅ 已完成' if theory_status['completed'] else '⏳ 進行中'}</p>
-            </div>
-
-            <!-- 階段 2 -->
-            <div style="padding: 15px; background: {'#e8f5e9' if practice_status['completed'] else ('#ffebee' if practice_status['locked'] else '#e3f2fd')};
-                       border-radius: 10px; border-left: 4px solid {'#4caf50' if practice_status['completed'] else ('#f44336' if practice_status['locked'] else '#2196f3')};">
-                <h4 style="margin-top: 0;">🛠️ {practice_status['name']}</h4>
-                <p><strong>狀態:</strong> {practice_status['status']}</p>
-                <p><strong>分數:</strong> {practice_status['score']} / {practice_status['pass_score']}</p>
-                <p><strong>進度:</strong> {'✅ 已完成' if practice_status['completed'] else ('🔒 已鎖定' if practice_status['locked'] else '⏳ 進行中')}</p>
-                {f"<p style='color: #f44336;'><strong>解鎖條件:</strong> {practice_status['lock_reason']}</p>" if practice_status['locked'] else ""}
-            </div>
-        </div>
-        """
-        return html
+        return _render_stage_status_html(
+            _stage_view(coordinator.get_stage_status(TrainingStage.THEORY)),
+            _stage_view(coordinator.get_stage_status(TrainingStage.PRACTICE)),
+        )
 
     # ===== 階段 1：理論學習 (Mock 實作) =====
 
-    def ask_theory_question(self, question: str, chat_history: list) -> Tuple[list, str]:
+    def ask_theory_question(self, question: str, chat_history: list, handle: dict):
         """
         理論問答（AI 學長 BOT）
 
+        先送出學員問題，回答產生後再分段送出（Gradio 產生器串流），
+        長回答不必等整段文字一次顯示
+
         Args:
             question: 學員問題
             chat_history: 對話歷史
+            handle: 工作階段鍵（gr.State）
 
-        Returns:
+        Yields:
             (updated_chat_history, input_cleared)
         """
         if not question.strip():
-            return chat_history, ""
+            yield chat_history, ""
+            return
+
+        session = self._session(handle)
 
-        if not self.current_student_id:
-            # Gradio Chatbot 格式：[{"role": "user"/"assistant", "content": "..."}]
-            if chat_history is None:
-                chat_history = []
+        # Gradio Chatbot 格式：[{"role": "user"/"assistant", "content": "..."}]
+        if chat_history is None:
+            chat_history = []
+
+        if not session.get("student_id"):
             chat_history.append({"role": "assistant", "content": "請先登入"})
-            return chat_history, ""
+            yield chat_history, ""
+            return
+
+        # 問題先顯示，等待回答期間輸入框即清空
+        chat_history.append({"role": "user", "content": question})
+        chat_history.append({"role": "assistant", "content": ""})
+        yield chat_history, ""
 
         # 使用 AI 學長 BOT 或 Mock 模式
         if self.use_ai_bot and self.mentor_bot:
             try:
-                # 使用 AI BOT 回答（包含反問機制）
-                answer = self.mentor_bot.ask(question, maintain_context=True)
+                # 由學員自己的 AI BOT 回答（包含反問機制）；
+                # 快取只用於對話的第一個問題，之後的回答取決於該學員先前的問答，不與其他學員共用
+                bot = self._session_bot(session)
+                context_free = not bot.conversation_history
+                answer = self.answer_cache.get(question) if context_free else None
+                if answer is not None:
+                    # 命中快取時仍記入對話歷史，後續追問才有上下文
+                    bot.conversation_history += [
+                        {"role": "user", "content": question},
+                        {"role": "assistant", "content": answer},
+                    ]
+                else:
+                    answer = bot.ask(question, maintain_context=True)
+                    # 只快取成功的回答（呼叫失敗時 BOT 回傳錯誤訊息，不會記入對話歷史）
+                    answered = bot.conversation_history[-1:] == [{"role": "assistant", "content": answer}]
+                    if context_free and answered:
+                        self.answer_cache.put(question, answer)
                 found_answer = True
             except Exception as e:
                 # AI 失敗時退回到 Mock 模式
                 print(f"[Warning] AI BOT 回答失敗: {e}，使用 Mock 模式")
                 answer = self._mock_answer(question)
-                found_answer = "cvd" in question.lower() or "真空" in question.lower() or "溫度" in question.lower()
+                found_answer = _match_theory(question.lower()) is not None
         else:
             # Mock 模式
             answer = self._mock_answer(question)
-            found_answer = "cvd" in question.lower() or "真空" in question.lower() or "溫度" in question.lower()
+            found_answer = _match_theory(question.lower()) is not None
 
         # 記錄互動
-        if self.tracker:
-            self.tracker.log_interaction(
+        tracker = session.get("tracker")
+        if tracker:
+            tracker.log_interaction(
                 InteractionType.THEORY_QUESTION,
                 {"question": question, "answer": answer},
                 success=found_answer
             )
 
-        # 更新對話（Gradio Chatbot 格式）
-        if chat_history is None:
-            chat_history = []
-
-        chat_history.append({"role": "user", "content": question})
-        chat_history.append({"role": "assistant", "content": answer})
+        # 分段更新回答
+        message = chat_history[-1]
+        for i in range(0, len(answer), _ANSWER_CHUNK_SIZE):
+            message["content"] = answer[:i + _ANSWER_CHUNK_SIZE]
+            yield chat_history, ""
 
-        return chat_history, ""
+    def _session_bot(self, session: dict):
+        """取得學員自己的 AI 學長 BOT（共用模型設定，對話歷史只含該學員的問答）"""
+        bot = session.get("mentor_bot")
+        if bot is None:
+            bot = session["mentor_bot"] = self.mentor_bot.fork()
+        return bot
 
     def _mock_answer(self, question: str) -> str:
         """Mock 回答（當 AI 不可用時）"""
-        mock_answers = {
-            "cvd": "CVD（Chemical Vapor Deposition，化學氣相沉積）是一種重要的薄膜沉積技術，通過化學反應在晶圓表面形成薄膜。\n\n主要類型包括：\n- PECVD（電漿增強CVD）\n- LPCVD（低壓CVD）\n- APCVD（常壓CVD）",
-            "真空": "真空系統是半導體製程的關鍵設備，主要功能包括：\n\n1. 提供無污染的製程環境\n2. 控制反應氣體的流動\n3. 確保薄膜品質\n\n真空度通常需要達到 10⁻⁶ Torr 以下。",
-            "溫度": "溫度控制對製程品質至關重要，影響因素包括：\n\n1. 反應速率\n2. 薄膜品質\n3. 設備壽命\n\n通常需要精確控制在 ±0.5°C 以內。",
-        }
-
         answer = "這是一個好問題！\n\n"
-        for keyword, mock_answer in mock_answers.items():
-            if keyword in question.lower():
-                answer += mock_answer
-                answer += "\n\n💡 你理解了嗎？還有什麼想問的？"
-                return answer
+        mock_answer = _match_theory(question.lower())
+        if mock_answer is not None:
+            answer += mock_answer
+            answer += "\n\n💡 你理解了嗎？還有什麼想問的？"
+            return answer
 
         answer += "關於這個問題，我建議你查閱相關的製程手冊和 SOP 文件。\n\n你也可以詢問更具體的問題，例如：\n- CVD 是什麼？\n- 真空系統如何運作？\n- 溫度控制的重要性？"
         return answer
 
-    def take_theory_test(self) -> Tuple[str, str, str]:
+    def take_theory_test(self, handle: dict) -> Tuple[str, str, str]:
         """
         參加理論測驗（使用 EvaluationSystem）
 
         Returns:
             (result_message, progress_html, stage_status)
         """
-        if not self.current_student_id:
+        session = self._session(handle)
+        if not session.get("student_id"):
             return "請先登入", "", ""
 
-        # Mock 測驗題目（未來接入真實題庫）
-        import random
+        coordinator = session["coordinator"]
+        tracker = session["tracker"]
 
-        mock_test_results = []
-        topics = ["CVD", "真空系統", "冷卻系統", "對準系統", "溫度控制", "壓力控制", "光學系統", "化學反應", "安全規範", "SOP"]
-        difficulties = ["easy", "medium", "hard"]
+        # Mock 測驗題目（未來接入真實題庫），一次產生所有題目的隨機結果
+        # 隨機正確率約 70-80%
+        correct = _TEST_RNG.random(_TEST_QUESTION_COUNT) > 0.25
+        topic_idx = _TEST_RNG.integers(0, len(_TEST_TOPICS), _TEST_QUESTION_COUNT)
+        difficulty_idx = _TEST_RNG.integers(0, len(_TEST_DIFFICULTIES), _TEST_QUESTION_COUNT)
 
-        for i in range(10):
-            # 隨機正確率約 70-80%
-            is_correct = random.random() > 0.25
-            mock_test_results.append({
-                "question": f"問題 {i+1}",
+        mock_test_results = [
+            {
+                "question": f"問題 {i}",
                 "is_correct": is_correct,
-                "topic": random.choice(topics),
-                "difficulty": random.choice(difficulties)
-            })
+                "topic": _TEST_TOPICS[t],
+                "difficulty": _TEST_DIFFICULTIES[d]
+            }
+            for i, (is_correct, t, d) in enumerate(
+                zip(correct.tolist(), topic_idx.tolist(), difficulty_idx.tolist()), 1
+            )
+        ]
 
         # 使用 EvaluationSystem 評分
         theory_eval = self.evaluator.evaluate_theory_test(mock_test_results)
         score = theory_eval['score']
 
         # 更新分數
-        result_message = self.coordinator.update_theory_score(score)
+        result_message = coordinator.update_theory_score(score)
 
         # 記錄測驗
-        self.tracker.log_interaction(
+        tracker.log_interaction(
             InteractionType.THEORY_TEST,
             {
                 "test_type": "理論測驗",
-                "questions": 10,
+                "questions": _TEST_QUESTION_COUNT,
                 "correct": theory_eval['correct_count'],
                 "evaluation": theory_eval
             },
@@ -348,21 +655,23 @@ class UnifiedTrainingSystem:
 
 ### 表現分析
 """
+        parts = [result_details]
 
         # 優勢主題
         if theory_eval['strengths']:
-            result_details += f"\n**✅ 優勢主題**: {', '.join(theory_eval['strengths'])}"
+            parts.append(f"\n**✅ 優勢主題**: {', '.join(theory_eval['strengths'])}")
 
         # 弱點主題
         if theory_eval['weaknesses']:
-            result_details += f"\n**⚠️ 需加強**: {', '.join(theory_eval['weaknesses'])}"
+            parts.append(f"\n**⚠️ 需加強**: {', '.join(theory_eval['weaknesses'])}")
 
-        result_details += f"\n\n{self._get_test_feedback(score)}"
+        parts.append(f"\n\n{self._get_test_feedback(score)}")
+        result_details = "".join(parts)
 
         # 更新進度
-        progress = self.coordinator.get_overall_progress()
+        progress = coordinator.get_overall_progress()
         progress_html = self._generate_progress_html(progress)
-        stage_status = self._generate_stage_status_html(progress)
+        stage_status = self._generate_stage_status_html(coordinator)
 
         return result_details, progress_html, stage_status
 
@@ -379,36 +688,43 @@ class UnifiedTrainingSystem:
 
     # ===== 階段 2：實作訓練 =====
 
-    def start_practice_scenario(self, difficulty: str) -> Tuple[str, str, str, str, str]:
+    def start_practice_scenario(self, difficulty: str,
+                                handle: dict) -> Tuple[str, str, str, str, str, dict]:
         """
         開始實作訓練情境
 
         Returns:
-            (equipment_html, dashboard_html, system_message, action_log, practice_status)
+            (equipment_html, dashboard_html, system_message, action_log, practice_status, handle)
         """
-        if not self.current_student_id:
-            return "", "", "請先登入", "", ""
+        session = self._session(handle)
+        if not session.get("student_id"):
+            return "", "", "請先登入", "", "", handle
 
         # 檢查是否可以進入
-        can_enter, message = self.coordinator.can_enter_practice()
+        can_enter, message = session["coordinator"].can_enter_practice()
 
         if not can_enter:
-            return "", "", f"🔒 {message}", "", "locked"
+            # 畫面已清空，下次需重新渲染
+            return "", "", f"🔒 {message}", "", "locked", {**handle, "display_key": None}
 
         # 初始化階段 2 模組（如果尚未初始化）
-        if not self.stage2_active:
-            self.scenario_engine = ScenarioEngine(self.secom_data_path)
-            self.digital_twin = LithographyDigitalTwin(self.secom_data_path)
-            self.nlu_controller = NaturalLanguageController()
-            self.action_executor = ActionExecutor(self.digital_twin)
-            self.stage2_active = True
+        if not session["stage2_active"]:
+            from core.scenario_engine import ScenarioEngine
+            from core.natural_language_controller import ActionExecutor
+            from core.digital_twin import LithographyDigitalTwin
+
+            session["scenario_engine"] = ScenarioEngine(self.secom_data_path)
+            session["digital_twin"] = LithographyDigitalTwin(self.secom_data_path)
+            session["action_executor"] = ActionExecutor(session["digital_twin"])
+            session["stage2_active"] = True
 
         # 初始化情境
-        scenario_info = self.scenario_engine.initialize_scenario(difficulty=difficulty)
+        scenario_info = session["scenario_engine"].initialize_scenario(difficulty=difficulty)
 
         # 生成設備圖和儀表板
         equipment_html = self._generate_equipment_diagram(scenario_info["initial_state"])
         dashboard_html = self._generate_dashboard(scenario_info["initial_state"])
+        handle = {**handle, "display_key": _display_key(scenario_info["initial_state"])}
 
         # 生成警報訊息
         system_message = f"""
@@ -430,47 +746,64 @@ class UnifiedTrainingSystem:
         action_log = f"[{scenario_info['scenario_name']}] 情境已開始\n"
 
         # 記錄階段切換
-        self.tracker.log_interaction(
+        session["tracker"].log_interaction(
             InteractionType.STAGE_SWITCH,
             {"from": TrainingStage.THEORY, "to": TrainingStage.PRACTICE}
         )
 
-        return equipment_html, dashboard_html, system_message, action_log, "active"
+        return equipment_html, dashboard_html, system_message, action_log, "active", handle
 
     def process_practice_input(self, user_input: str, equipment_html: str, dashboard_html: str,
-                               system_message: str, action_log: str) -> Tuple[str, str, str, str, str]:
+                               system_message: str, action_log: str,
+                               handle: dict) -> Tuple[str, str, str, str, str, dict]:
         """
         處理實作訓練的輸入
 
+        設備圖與儀表板顯示內容沒有變化時回傳 gr.update()，不重送 HTML；
+        上次送出的顯示內容記在各分頁自己的 handle（同一學員的分頁共用工作階段，
+        重新登入後頁面也是空白，不能以工作階段中的紀錄判斷）
+
         Returns:
-            (cleared_input, equipment_html, dashboard_html, system_message, action_log)
+            (cleared_input, equipment_html, dashboard_html, system_message, action_log, handle)
         """
-        if not user_input.strip() or not self.stage2_active:
-            return "", equipment_html, dashboard_html, system_message, action_log
+        import gradio as gr
+
+        session = self._session(handle)
+        if not user_input.strip() or not session.get("stage2_active"):
+            return "", gr.update(), gr.update(), system_message, action_log, handle
+
+        scenario_engine = session["scenario_engine"]
+        tracker = session["tracker"]
 
         # 解析輸入
         parsed_input = self.nlu_controller.parse_input(user_input)
 
         # 執行動作
-        current_state = self.scenario_engine.get_current_state()
+        current_state = scenario_engine.get_current_state()
 
         # 驗證
         is_valid, validation_msg = self.nlu_controller.validate_action(parsed_input, current_state)
 
         if not is_valid:
             system_message += f"\n\n[錯誤] {validation_msg}"
-            return "", equipment_html, dashboard_html, system_message, action_log
+            return "", gr.update(), gr.update(), system_message, action_log, handle
 
         # 執行
-        action_result = self.action_executor.execute(parsed_input, current_state)
+        action_result = session["action_executor"].execute(parsed_input, current_state)
 
         # 更新狀態
-        self.scenario_engine.apply_action_effect(action_result)
-
-        # 更新顯示
-        new_state = self.scenario_engine.get_current_state()
-        equipment_html = self._generate_equipment_diagram(new_state)
-        dashboard_html = self._generate_dashboard(new_state)
+        scenario_engine.apply_action_effect(action_result)
+
+        # 更新顯示（顯示內容不變就不重新渲染）
+        new_state = scenario_engine.get_current_state()
+        display_key = _display_key(new_state)
+        if display_key == handle.get("display_key"):
+            equipment_html = gr.update()
+            dashboard_html = gr.update()
+        else:
+            equipment_html = self._generate_equipment_diagram(new_state)
+            dashboard_html = self._generate_dashboard(new_state)
+            handle = {**handle, "display_key": display_key}
 
         # 更新訊息
         system_message += f"\n\n{action_result['message']}"
@@ -479,131 +812,86 @@ class UnifiedTrainingSystem:
         action_log += f"\n[操作] {user_input}"
 
         # 記錄互動
-        self.tracker.log_interaction(
+        topic = parsed_input.get("category", "unknown")
+        tracker.log_interaction(
             InteractionType.PRACTICE_OPERATION,
-            {"operation": user_input, "result": action_result, "topic": parsed_input.get("category", "unknown")},
+            {"operation": user_input, "result": action_result, "topic": topic},
             success=action_result["success"]
         )
+        session["recent_results"].append((action_result["success"], user_input, topic))
 
         # 智能推薦：檢查是否需要推薦
-        recent_ops = self.tracker.get_interactions_by_type(InteractionType.PRACTICE_OPERATION)
-        recent_failures = [op for op in recent_ops[-5:] if not op.get("success", False)]
+        recent_failures = [r for r in session["recent_results"] if not r[0]]
 
         if self.recommender.should_trigger_recommendation(recent_failures, failure_threshold=3):
             # 獲取知識盲點
-            knowledge_gaps = self.tracker.get_knowledge_gaps()
+            knowledge_gaps = tracker.get_knowledge_gaps()
 
             # 生成推薦
             recommendations = self.recommender.recommend_topics(
-                failed_operations=[{"operation": op["data"]["operation"], "topic": op["data"].get("topic", "unknown")} for op in recent_failures],
+                failed_operations=[{"operation": operation, "topic": topic} for _, operation, topic in recent_failures],
                 knowledge_gaps=knowledge_gaps,
                 max_recommendations=3
             )
 
             if recommendations:
-                system_message += "\n\n" + "="*50 + "\n"
-                system_message += "💡 **智能推薦系統**\n\n"
-                system_message += "偵測到你在某些操作上遇到困難，建議複習以下主題：\n\n"
-
-                for i, rec in enumerate(recommendations, 1):
-                    system_message += f"{i}. {rec['recommendation']}\n"
-
-                system_message += "\n你可以返回「理論學習」頁面複習這些主題。\n"
-                system_message += "="*50
+                template = _REC_TEMPLATES.get(len(recommendations)) or _recommendation_template(len(recommendations))
+                system_message += template.format(*(rec['recommendation'] for rec in recommendations))
 
-        return "", equipment_html, dashboard_html, system_message, action_log
+        return "", equipment_html, dashboard_html, system_message, action_log, handle
 
     def _generate_equipment_diagram(self, state: dict) -> str:
-        """生成設備示意圖（簡化版）"""
-        lens_color = "#ff4444" if state.get("lens_temp", 23) > 25 else "#44ff44"
-        cooling_color = "#ff4444" if state.get("cooling_flow", 5.0) < 4.0 else "#44ff44"
-
-        html = f"""
-        <div style="background: #1e3c72; padding: 20px; border-radius: 10px;">
-            <h3 style="color: white; text-align: center;">曝光機設備狀態</h3>
-            <svg width="100%" height="300" viewBox="0 0 400 300">
-                <!-- 鏡頭 -->
-                <rect x="150" y="20" width="100" height="60" fill="{lens_color}" stroke="#333" stroke-width="2" rx="5"/>
-                <text x="200" y="55" text-anchor="middle" fill="white" font-size="14">鏡頭</text>
-
-                <!-- 冷卻系統 -->
-                <rect x="20" y="100" width="80" height="50" fill="{cooling_color}" stroke="#333" stroke-width="2" rx="5"/>
-                <text x="60" y="130" text-anchor="middle" fill="white" font-size="12">冷卻</text>
-
-                <!-- 腔體 -->
-                <rect x="130" y="120" width="140" height="100" fill="#888" stroke="#333" stroke-width="3" rx="10"/>
-                <text x="200" y="175" text-anchor="middle" fill="white" font-size="14">真空腔體</text>
+        """生成設備示意圖的顏色更新（外框 SVG 已於介面建立時送出）"""
+        lens_hot = state.get("lens_temp", 23) > 25
+        cooling_low = state.get("cooling_flow", 5.0) < 4.0
 
-                <!-- 晶圓 -->
-                <ellipse cx="200" cy="250" rx="40" ry="15" fill="#666" stroke="#333" stroke-width="2"/>
-                <text x="200" y="255" text-anchor="middle" fill="white" font-size="11">晶圓</text>
-            </svg>
-            <div style="text-align: center; color: white; margin-top: 10px;">
-                <span style="color: #44ff44;">● 正常</span>
-                <span style="margin-left: 20px; color: #ff4444;">● 異常</span>
-            </div>
-        </div>
-        """
-        return html
+        return _EQUIPMENT_COLORS_HTML[lens_hot, cooling_low]
 
     def _generate_dashboard(self, state: dict) -> str:
         """生成參數儀表板（簡化版）"""
-        def get_color(value, min_val, max_val, normal_min, normal_max):
-            if normal_min <= value <= normal_max:
-                return "#4caf50"
-            elif min_val <= value <= max_val:
-                return "#ff9800"
-            else:
-                return "#f44336"
-
-        params = [
-            {"name": "鏡頭溫度", "value": state.get("lens_temp", 23.0), "unit": "°C",
-             "min": 20, "max": 30, "normal_min": 22, "normal_max": 24},
-            {"name": "冷卻流量", "value": state.get("cooling_flow", 5.0), "unit": "L/min",
-             "min": 0, "max": 10, "normal_min": 4.5, "normal_max": 5.5},
-            {"name": "真空壓力", "value": state.get("vacuum_pressure", 1e-6), "unit": "Torr",
-             "min": 0, "max": 1e-4, "normal_min": 5e-7, "normal_max": 2e-6, "scientific": True},
-        ]
-
-        html = """
-        <div style="background: #f5f5f5; padding: 15px; border-radius: 10px;">
-            <h3 style="text-align: center; margin-top: 0;">即時參數監控</h3>
-        """
-
-        for param in params:
-            value = param["value"]
-            color = get_color(value, param["min"], param["max"], param["normal_min"], param["normal_max"])
-            percentage = (value - param["min"]) / (param["max"] - param["min"]) * 100 if not param.get("scientific") else 50
-
-            value_display = f"{value:.2e}" if param.get("scientific") else f"{value:.2f}"
+        lens_temp = state.get("lens_temp", 23.0)
+        cooling_flow = state.get("cooling_flow", 5.0)
+        vacuum_pressure = state.get("vacuum_pressure", 1e-6)
+
+        lens_min, lens_max = _LENS_RANGE[:2]
+        cooling_min, cooling_max = _COOLING_RANGE[:2]
+
+        return _DASHBOARD_TMPL.format(
+            lens_temp_color=_gauge_color(lens_temp, *_LENS_RANGE),
+            lens_temp_value=f"{lens_temp:.2f}",
+            lens_temp_pct=(lens_temp - lens_min) / (lens_max - lens_min) * 100,
+            cooling_flow_color=_gauge_color(cooling_flow, *_COOLING_RANGE),
+            cooling_flow_value=f"{cooling_flow:.2f}",
+            cooling_flow_pct=(cooling_flow - cooling_min) / (cooling_max - cooling_min) * 100,
+            vacuum_pressure_color=_gauge_color(vacuum_pressure, *_VACUUM_RANGE),
+            vacuum_pressure_value=f"{vacuum_pressure:.2e}",
+        )
 
-            html += f"""
-            <div style="margin-bottom: 15px;">
-                <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                    <span style="font-weight: bold;">{param['name']}</span>
-                    <span style="color: {color}; font-weight: bold;">{value_display} {param['unit']}</span>
-                </div>
-                <div style="background: #ddd; height: 20px; border-radius: 10px; overflow: hidden;">
-                    <div style="background: {color}; height: 100%; width: {percentage}%;"></div>
-                </div>
-            </div>
-            """
+    # ===== 學習報告 =====
 
-        html += "</div>"
-        return html
+    def generate_report(self, handle: dict):
+        """
+        生成增強版學習報告（整合評分系統）
 
-    # ===== 學習報告 =====
+        報告分段產生，每完成一段就送出目前的內容（Gradio 產生器串流）
 
-    def generate_report(self) -> str:
-        """生成增強版學習報告（整合評分系統）"""
-        if not self.current_student_id:
-            return "請先登入"
+        Yields:
+            目前已完成的報告 Markdown
+        """
+        parts = []
+        for section in self._report_sections(self._session(handle)):
+            parts.append(section)
+            yield "".join(parts)
 
-        # 獲取基本報告
-        report = self.tracker.generate_learning_report()
+    def _report_sections(self, session: dict):
+        """依序產生學習報告的各段 Markdown"""
+        if not session.get("student_id"):
+            yield "請先登入"
+            return
 
-        # 獲取訓練進度
-        progress = self.coordinator.get_overall_progress()
+        # 獲取基本報告（背景執行緒），同時在目前執行緒獲取訓練進度
+        report_future = self.report_pool.submit(session["tracker"].generate_learning_report)
+        progress = session["coordinator"].get_overall_progress()
 
         # 使用評分系統進行綜合評估
         overall_eval = self.evaluator.evaluate_overall(
@@ -611,6 +899,8 @@ class UnifiedTrainingSystem:
             practice_score=progress['practice_score']
         )
 
+        report = report_future.result()
+
         # 計算學習效率
         efficiency = self.evaluator.calculate_learning_efficiency(
             score=overall_eval['overall_score'],
@@ -618,11 +908,8 @@ class UnifiedTrainingSystem:
             interaction_count=report['statistics']['total_interactions']
         )
 
-        # 生成改進建議
-        suggestions = self.evaluator.generate_improvement_suggestions(overall_eval)
-
-        # 構建增強版報告
-        report_md = f"""
+        # 構建增強版報告：綜合評估
+        parts = [f"""
 # 📋 學習報告
 
 **學員 ID**: {report['student_id']}
@@ -642,11 +929,12 @@ class UnifiedTrainingSystem:
 - **可進入真機實習**: {'✅ 是' if overall_eval['ready_for_real_practice'] else '❌ 否'}
 
 ### 評語
-"""
-        for comment in overall_eval['comments']:
-            report_md += f"- {comment}\n"
+"""]
+        parts.extend(f"- {comment}\n" for comment in overall_eval['comments'])
+        yield "".join(parts)
 
-        report_md += f"""
+        # 學習效率與詳細統計
+        yield f"""
 ---
 
 ## 📚 學習效率分析
@@ -681,19 +969,23 @@ class UnifiedTrainingSystem:
 ## 💡 個性化改進建議
 
 """
-        for i, suggestion in enumerate(suggestions, 1):
-            report_md += f"{i}. {suggestion}\n"
+
+        # 生成改進建議
+        suggestions = self.evaluator.generate_improvement_suggestions(overall_eval)
+        yield "".join(f"{i}. {suggestion}\n" for i, suggestion in enumerate(suggestions, 1))
 
         # 知識盲點分析
         if report['knowledge_gaps']:
-            report_md += "\n---\n\n## ⚠️ 知識盲點分析\n\n"
-            report_md += "以下主題需要特別加強：\n\n"
+            parts = [
+                "\n---\n\n## ⚠️ 知識盲點分析\n\n",
+                "以下主題需要特別加強：\n\n",
+            ]
 
             for gap in report['knowledge_gaps'][:5]:  # 最多顯示5個
-                report_md += f"- **{gap['topic']}**\n"
-                report_md += f"  - 錯誤次數: {gap['error_count']} 次\n"
-                report_md += f"  - 嘗試次數: {gap['total_attempts']} 次\n"
-                report_md += f"  - 正確率: {gap['accuracy']}%\n\n"
+                parts.append(f"- **{gap['topic']}**\n")
+                parts.append(f"  - 錯誤次數: {gap['error_count']} 次\n")
+                parts.append(f"  - 嘗試次數: {gap['total_attempts']} 次\n")
+                parts.append(f"  - 正確率: {gap['accuracy']}%\n\n")
 
             # 使用智能推薦器生成學習路徑
             recommendations = self.recommender.recommend_topics(
@@ -702,35 +994,44 @@ class UnifiedTrainingSystem:
             )
 
             if recommendations:
-                report_md += "\n### 📌 建議複習順序\n\n"
+                parts.append("\n### 📌 建議複習順序\n\n")
                 learning_path = self.recommender.generate_learning_path(recommendations)
 
                 for i, step in enumerate(learning_path, 1):
                     time_est = step.get('estimated_time_minutes', 30)
-                    report_md += f"{i}. **{step['topic']}** (預估 {time_est} 分鐘)\n"
+                    parts.append(f"{i}. **{step['topic']}** (預估 {time_est} 分鐘)\n")
 
                 total_time = sum(step.get('estimated_time_minutes', 0) for step in learning_path)
-                report_md += f"\n*預估總複習時間: {total_time} 分鐘 ({total_time/60:.1f} 小時)*\n"
+                parts.append(f"\n*預估總複習時間: {total_time} 分鐘 ({total_time/60:.1f} 小時)*\n")
+
+            yield "".join(parts)
 
         # 學習曲線
+        parts = []
         if report['learning_curve']['theory_accuracy'] or report['learning_curve']['practice_success_rate']:
-            report_md += "\n---\n\n## 📈 學習曲線趨勢\n\n"
+            parts.append("\n---\n\n## 📈 學習曲線趨勢\n\n")
 
             if report['learning_curve']['theory_accuracy']:
                 latest_theory = report['learning_curve']['theory_accuracy'][-1] if report['learning_curve']['theory_accuracy'] else 0
-                report_md += f"- **理論學習**: 最新正確率 {latest_theory}%\n"
+                parts.append(f"- **理論學習**: 最新正確率 {latest_theory}%\n")
 
             if report['learning_curve']['practice_success_rate']:
                 latest_practice = report['learning_curve']['practice_success_rate'][-1] if report['learning_curve']['practice_success_rate'] else 0
-                report_md += f"- **實作訓練**: 最新成功率 {latest_practice}%\n"
-
-        report_md += "\n---\n\n*報告由系統自動生成*\n"
-
-        return report_md
+                parts.append(f"- **實作訓練**: 最新成功率 {latest_practice}%\n")
 
+        parts.append("\n---\n\n*報告由系統自動生成*\n")
+        yield "".join(parts)
 
 def create_unified_interface(secom_data_path: str):
     """建立統一訓練介面"""
+    import gradio as gr
+
+    # 3D 設備展示模組（選擇性載入）
+    try:
+        from interface.equipment_viewer_3d import create_3d_viewer_tab
+        has_3d_viewer = True
+    except Exception:
+        has_3d_viewer = False
 
     system = UnifiedTrainingSystem(secom_data_path)
 
@@ -743,6 +1044,9 @@ def create_unified_interface(secom_data_path: str):
         本系統提供完整的三階段訓練路徑，從理論學習到實作演練，全方位培養故障處理能力。
         """)
 
+        # 學員工作階段鍵（登入後為學員 ID，狀態本身在 self.sessions）
+        session = gr.State({})
+
         # ===== 學員登入區 =====
         with gr.Row():
             student_id_input = gr.Textbox(label="學員 ID", placeholder="請輸入學員 ID (例如：S001)")
@@ -808,7 +1112,10 @@ def create_unified_interface(secom_data_path: str):
                     start_practice_btn = gr.Button("開始新情境", variant="primary")
 
                 with gr.Row():
-                    equipment_display = gr.HTML(label="設備狀態")
+                    with gr.Column():
+                        gr.HTML(value=_EQUIPMENT_SHELL_HTML, label="設備狀態")
+                        # 只承載顏色 CSS 變數，畫面上不佔空間
+                        equipment_display = gr.HTML()
                     dashboard_display = gr.HTML(label="參數監控")
 
                 system_messages = gr.Textbox(label="系統訊息", lines=10, interactive=False)
@@ -835,7 +1142,7 @@ def create_unified_interface(secom_data_path: str):
                 report_display = gr.Markdown()
 
             # Tab 4: 3D 設備展示
-            if HAS_3D_VIEWER:
+            if has_3d_viewer:
                 create_3d_viewer_tab()
 
         # ===== 事件綁定 =====
@@ -843,54 +1150,54 @@ def create_unified_interface(secom_data_path: str):
         # 登入
         login_btn.click(
             fn=system.login_student,
-            inputs=[student_id_input, student_name_input],
-            outputs=[welcome_msg, progress_display, stage_status_display]
+            inputs=[student_id_input, student_name_input, session],
+            outputs=[welcome_msg, progress_display, stage_status_display, session]
         )
 
         # 理論問答
         theory_send_btn.click(
             fn=system.ask_theory_question,
-            inputs=[theory_input, theory_chatbot],
+            inputs=[theory_input, theory_chatbot, session],
             outputs=[theory_chatbot, theory_input]
         )
 
         theory_input.submit(
             fn=system.ask_theory_question,
-            inputs=[theory_input, theory_chatbot],
+            inputs=[theory_input, theory_chatbot, session],
             outputs=[theory_chatbot, theory_input]
         )
 
         # 理論測驗
         theory_test_btn.click(
             fn=system.take_theory_test,
-            inputs=[],
+            inputs=[session],
             outputs=[theory_result, progress_display, stage_status_display]
         )
 
         # 開始實作訓練
         start_practice_btn.click(
             fn=system.start_practice_scenario,
-            inputs=[difficulty_choice],
-            outputs=[equipment_display, dashboard_display, system_messages, action_log, practice_status]
+            inputs=[difficulty_choice, session],
+            outputs=[equipment_display, dashboard_display, system_messages, action_log, practice_status, session]
         )
 
         # 實作操作
         practice_send_btn.click(
             fn=system.process_practice_input,
-            inputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log],
-            outputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log]
+            inputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log, session],
+            outputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log, session]
         )
 
         practice_input.submit(
             fn=system.process_practice_input,
-            inputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log],
-            outputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log]
+            inputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log, session],
+            outputs=[practice_input, equipment_display, dashboard_display, system_messages, action_log, session]
         )
 
         # 生成報告
         generate_report_btn.click(
             fn=system.generate_report,
-            inputs=[],
+            inputs=[session],
             outputs=[report_display]
         )
 
@@ -4,6 +4,7 @@
 仿真實控制面板的互動式訓練系統
 """
 
+import functools
 import gradio as gr
 import sys
 import os
@@ -11,80 +12,80 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import random
 import json
+import time
+from collections import deque
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:  # 由啟動腳本匯入時根目錄已在路徑中
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from core.digital_twin import LithographyDigitalTwin
 from core.a2a_coordinator import A2ACoordinator
 from core.scenario_generator import ScenarioGenerator
-from datetime import datetime
 
 
 # ===== HTML/CSS 模板 =====
 
-def get_equipment_diagram_html(fault_status: Dict = None) -> str:
-    """生成曝光機示意圖 HTML"""
-
-    # 根據故障狀態決定顏色
-    lens_color = "#ff4444" if fault_status and fault_status.get("lens_fault") else "#44ff44"
-    wafer_color = "#ff4444" if fault_status and fault_status.get("wafer_fault") else "#44ff44"
-    stage_color = "#ff4444" if fault_status and fault_status.get("stage_fault") else "#44ff44"
-    cooling_color = "#ff4444" if fault_status and fault_status.get("cooling_fault") else "#44ff44"
-    vacuum_color = "#ff4444" if fault_status and fault_status.get("vacuum_fault") else "#44ff44"
-
-    html = f"""
+# 示意圖動畫改用 CSS（由瀏覽器合成層處理，重新渲染時不必重建 SMIL 動畫）
+_EQUIPMENT_ANIMATION_CSS = """<style>
+        @keyframes vt-pulse {0%, 100% {opacity: 1} 50% {opacity: 0.7}}
+        @keyframes vt-glow {0%, 100% {transform: scale(1)} 50% {transform: scale(1.2)}}
+        @keyframes vt-beam {from {stroke-dashoffset: 0} to {stroke-dashoffset: 10}}
+        @keyframes vt-flow {0%, 100% {transform: translateY(0)} 50% {transform: translateY(10px)}}
+        @keyframes vt-pump {0%, 100% {transform: translateX(0)} 50% {transform: translateX(10px)}}
+        .vt-pulse {animation: vt-pulse 2s linear infinite}
+        .vt-glow {animation: vt-glow 1s linear infinite; transform-box: fill-box; transform-origin: center}
+        .vt-beam {animation: vt-beam 0.5s linear infinite}
+        .vt-flow {animation: vt-flow 1s linear infinite}
+        .vt-pump {animation: vt-pump 1.5s linear infinite}
+        </style>"""
+
+
+# 示意圖外框：建立介面時送出一次，部件顏色與狀態文字綁定 CSS 變數
+_EQUIPMENT_SHELL_HTML = f"""
     <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.3);">
+        {_EQUIPMENT_ANIMATION_CSS}
         <h2 style="color: white; text-align: center; margin-bottom: 20px;">曝光機示意圖</h2>
         <svg width="100%" height="400" viewBox="0 0 400 400" style="background: #2d3748; border-radius: 10px;">
 
             <!-- 光源系統 -->
             <g id="lens-system">
-                <rect x="150" y="20" width="100" height="60" fill="{lens_color}" stroke="white" stroke-width="2" rx="5">
-                    <animate attributeName="opacity" values="1;0.7;1" dur="2s" repeatCount="indefinite"/>
-                </rect>
+                <rect class="vt-pulse" x="150" y="20" width="100" height="60" style="fill: var(--vt-lens-color, #44ff44);" stroke="white" stroke-width="2" rx="5"/>
                 <text x="200" y="55" text-anchor="middle" fill="black" font-size="12" font-weight="bold">光學鏡頭</text>
-                <circle cx="200" cy="110" r="15" fill="#ffeb3b" stroke="white" stroke-width="2">
-                    <animate attributeName="r" values="15;18;15" dur="1s" repeatCount="indefinite"/>
-                </circle>
+                <circle class="vt-glow" cx="200" cy="110" r="15" fill="#ffeb3b" stroke="white" stroke-width="2"/>
             </g>
 
             <!-- 光束 -->
-            <line x1="200" y1="125" x2="200" y2="180" stroke="#ffeb3b" stroke-width="3" stroke-dasharray="5,5">
-                <animate attributeName="stroke-dashoffset" values="0;10" dur="0.5s" repeatCount="indefinite"/>
-            </line>
+            <line class="vt-beam" x1="200" y1="125" x2="200" y2="180" stroke="#ffeb3b" stroke-width="3" stroke-dasharray="5,5"/>
 
             <!-- 晶圓 -->
             <g id="wafer">
-                <circle cx="200" cy="200" r="50" fill="{wafer_color}" stroke="white" stroke-width="3"/>
+                <circle cx="200" cy="200" r="50" style="fill: var(--vt-wafer-color, #44ff44);" stroke="white" stroke-width="3"/>
                 <circle cx="200" cy="200" r="45" fill="none" stroke="white" stroke-width="1" stroke-dasharray="5,5"/>
                 <text x="200" y="205" text-anchor="middle" fill="black" font-size="14" font-weight="bold">晶圓</text>
             </g>
 
             <!-- 平台 -->
             <g id="stage">
-                <rect x="100" y="260" width="200" height="40" fill="{stage_color}" stroke="white" stroke-width="2" rx="5"/>
+                <rect x="100" y="260" width="200" height="40" style="fill: var(--vt-stage-color, #44ff44);" stroke="white" stroke-width="2" rx="5"/>
                 <text x="200" y="285" text-anchor="middle" fill="black" font-size="12" font-weight="bold">移動平台</text>
             </g>
 
             <!-- 冷卻系統 -->
             <g id="cooling">
-                <rect x="20" y="120" width="60" height="80" fill="{cooling_color}" stroke="white" stroke-width="2" rx="5"/>
+                <rect x="20" y="120" width="60" height="80" style="fill: var(--vt-cooling-color, #44ff44);" stroke="white" stroke-width="2" rx="5"/>
                 <text x="50" y="145" text-anchor="middle" fill="black" font-size="10" font-weight="bold">冷卻</text>
                 <text x="50" y="160" text-anchor="middle" fill="black" font-size="10" font-weight="bold">系統</text>
                 <!-- 流動效果 -->
-                <circle cx="50" cy="180" r="3" fill="#00bcd4">
-                    <animate attributeName="cy" values="180;190;180" dur="1s" repeatCount="indefinite"/>
-                </circle>
+                <circle class="vt-flow" cx="50" cy="180" r="3" fill="#00bcd4"/>
             </g>
 
             <!-- 真空系統 -->
             <g id="vacuum">
-                <rect x="320" y="120" width="60" height="80" fill="{vacuum_color}" stroke="white" stroke-width="2" rx="5"/>
+                <rect x="320" y="120" width="60" height="80" style="fill: var(--vt-vacuum-color, #44ff44);" stroke="white" stroke-width="2" rx="5"/>
                 <text x="350" y="145" text-anchor="middle" fill="black" font-size="10" font-weight="bold">真空</text>
                 <text x="350" y="160" text-anchor="middle" fill="black" font-size="10" font-weight="bold">系統</text>
-                <path d="M 340 175 L 345 180 L 340 185" stroke="white" stroke-width="2" fill="none">
-                    <animateTransform attributeName="transform" type="translate" values="0,0; 10,0; 0,0" dur="1.5s" repeatCount="indefinite"/>
-                </path>
+                <path class="vt-pump" d="M 340 175 L 345 180 L 340 185" stroke="white" stroke-width="2" fill="none"/>
             </g>
 
             <!-- 連接線 -->
@@ -92,121 +93,237 @@ def get_equipment_diagram_html(fault_status: Dict = None) -> str:
             <line x1="300" y1="160" x2="320" y2="160" stroke="white" stroke-width="2" stroke-dasharray="3,3"/>
 
             <!-- 狀態指示 -->
-            <text x="200" y="370" text-anchor="middle" fill="white" font-size="14" font-weight="bold">
-                系統狀態: {"異常" if fault_status and any(fault_status.values()) else "正常"}
+            <text x="200" y="370" text-anchor="middle" fill="white" font-size="14" font-weight="bold" style="visibility: var(--vt-normal-visibility, visible);">
+                系統狀態: 正常
+            </text>
+            <text x="200" y="370" text-anchor="middle" fill="white" font-size="14" font-weight="bold" style="visibility: var(--vt-fault-visibility, hidden);">
+                系統狀態: 異常
             </text>
 
         </svg>
     </div>
     """
-    return html
 
+_FAULT_COLOR = "#ff4444"
+_NORMAL_COLOR = "#44ff44"
 
-def get_parameter_display_html(params: Dict) -> str:
-    """生成參數儀表板 HTML"""
 
-    def get_color(value, normal_min, normal_max):
-        if normal_min <= value <= normal_max:
-            return "#4caf50"  # 綠色
-        elif normal_min * 0.8 <= value <= normal_max * 1.2:
-            return "#ff9800"  # 黃色
-        else:
-            return "#f44336"  # 紅色
-
-    lens_temp = params.get("lens_temp", 450)
-    cooling_flow = params.get("cooling_flow", 5.0)
-    vacuum_pressure = params.get("vacuum_pressure", 1e-6)
-    light_intensity = params.get("light_intensity", 100)
-    x_error = params.get("x_error", 0)
-    y_error = params.get("y_error", 0)
-
-    html = f"""
+# 每次動作只送出 CSS 變數（約 300 bytes），不重送整張 SVG
+_EQUIPMENT_STATE_TMPL = (
+    "<style>:root{{"
+    "--vt-lens-color:{lens_color};--vt-wafer-color:{wafer_color};--vt-stage-color:{stage_color};"
+    "--vt-cooling-color:{cooling_color};--vt-vacuum-color:{vacuum_color};"
+    "--vt-normal-visibility:{normal_visibility};--vt-fault-visibility:{fault_visibility};"
+    "}}</style>"
+)
+
+
+# 故障位元：各部件一個位元，fault_bits 為 0 表示全部正常
+_LENS_FAULT = 1
+_WAFER_FAULT = 2
+_STAGE_FAULT = 4
+_COOLING_FAULT = 8
+_VACUUM_FAULT = 16
+
+# fault_status 字典鍵 → 故障位元
+_FAULT_BITS = {
+    "lens_fault": _LENS_FAULT,
+    "wafer_fault": _WAFER_FAULT,
+    "stage_fault": _STAGE_FAULT,
+    "cooling_fault": _COOLING_FAULT,
+    "vacuum_fault": _VACUUM_FAULT,
+}
+
+
+def _render_equipment_state(fault_bits: int) -> str:
+    """代換示意圖狀態"""
+    def color(bit):
+        return _FAULT_COLOR if fault_bits & bit else _NORMAL_COLOR
+
+    return _EQUIPMENT_STATE_TMPL.format(
+        lens_color=color(_LENS_FAULT), wafer_color=color(_WAFER_FAULT), stage_color=color(_STAGE_FAULT),
+        cooling_color=color(_COOLING_FAULT), vacuum_color=color(_VACUUM_FAULT),
+        normal_visibility="hidden" if fault_bits else "visible",
+        fault_visibility="visible" if fault_bits else "hidden",
+    )
+
+
+# 五個部件只有 32 種故障組合，匯入時全部代換好，渲染時直接以位元組合查表
+_EQUIPMENT_STATES = tuple(_render_equipment_state(bits) for bits in range(32))
+
+
+def get_equipment_state_html(fault_bits: int = 0) -> str:
+    """生成曝光機示意圖的狀態更新（外框 SVG 已於介面建立時送出）"""
+    return _EQUIPMENT_STATES[fault_bits]
+
+
+def get_equipment_diagram_html(fault_bits: int = 0) -> str:
+    """生成完整的曝光機示意圖 HTML（外框 + 狀態）"""
+    return _EQUIPMENT_SHELL_HTML + _EQUIPMENT_STATES[fault_bits]
+
+
+# 參數儀表板模板：外框 + 六張相同結構的卡片（每張只有數值、顏色與進度條寬度會變）
+_PARAMETER_DISPLAY_TMPL = """
     <div style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); padding: 20px; border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.3);">
         <h2 style="color: white; text-align: center; margin-bottom: 20px;">即時參數監控</h2>
 
         <!-- 參數卡片 -->
         <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
+{cards}
+        </div>
+    </div>
+    """
 
-            <!-- 鏡頭溫度 -->
+_CARD_TMPL = """
+            <!-- {comment} -->
             <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">🌡️ 鏡頭溫度</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(lens_temp, 400, 450)};">{lens_temp}°C</span>
+                    <span style="font-weight: bold; font-size: 14px;">{label}</span>
+                    <span style="font-size: 20px; font-weight: bold; color: {color};">{value}</span>
                 </div>
                 <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(lens_temp, 400, 450)}; height: 100%; width: {min(lens_temp/5, 100)}%; transition: all 0.3s;"></div>
+                    <div style="background: {color}; height: 100%; width: {width}%; transition: all 0.3s;"></div>
                 </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: 400-450°C</div>
+                <div style="font-size: 11px; color: #666; margin-top: 5px;">{normal}</div>
             </div>
+"""
 
-            <!-- 冷卻水流量 -->
-            <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">💧 冷卻流量</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(cooling_flow, 4.5, 5.5)};">{cooling_flow} L/min</span>
-                </div>
-                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(cooling_flow, 4.5, 5.5)}; height: 100%; width: {cooling_flow*10}%; transition: all 0.3s;"></div>
-                </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: 4.5-5.5 L/min</div>
-            </div>
 
-            <!-- 真空壓力 -->
-            <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">🔘 真空壓力</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(vacuum_pressure*1e6, 0.1, 1)};">{vacuum_pressure:.1e} Torr</span>
-                </div>
-                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(vacuum_pressure*1e6, 0.1, 1)}; height: 100%; width: {min(vacuum_pressure*1e7, 100)}%; transition: all 0.3s;"></div>
-                </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: < 1e-6 Torr</div>
-            </div>
+def _thresholds(normal_min, normal_max) -> Tuple[float, float, float, float]:
+    """(下限×0.8, 下限, 上限, 上限×1.2)，匯入時先算好"""
+    return (normal_min * 0.8, normal_min, normal_max, normal_max * 1.2)
+
+
+# 各參數的顏色門檻（真空壓力以 ×1e6 後的數值比較，XY 誤差以絕對值比較）
+_LENS_THRESHOLDS = _thresholds(400, 450)
+_COOLING_THRESHOLDS = _thresholds(4.5, 5.5)
+_VACUUM_THRESHOLDS = _thresholds(0.1, 1)
+_LIGHT_THRESHOLDS = _thresholds(90, 110)
+_ALIGNMENT_THRESHOLDS = _thresholds(0, 50)
+
+# 依落在第幾個區間取色：紅（過低）、黃、綠（正常）、黃、紅（過高）
+_COLOR_TABLE = ("#f44336", "#ff9800", "#4caf50", "#ff9800", "#f44336")
+
+
+def _param_color(value, thresholds) -> str:
+    """參數顏色：正常範圍綠色、±20% 內黃色、其餘紅色（比較結果相加即為色表索引）"""
+    low_warn, low, high, high_warn = thresholds
+    return _COLOR_TABLE[(value >= low_warn) + (value >= low) + (value > high) + (value > high_warn)]
+
+
+# 卡片規格：參數 → (註解, 標題, 數值格式, 正常範圍說明, 門檻, 比較值, 進度條寬度)
+_CARD_SPECS = {
+    "lens_temp": ("鏡頭溫度", "🌡️ 鏡頭溫度", "{}°C", "正常: 400-450°C",
+                  _LENS_THRESHOLDS, lambda v: v, lambda v: min(v/5, 100)),
+    "cooling_flow": ("冷卻水流量", "💧 冷卻流量", "{} L/min", "正常: 4.5-5.5 L/min",
+                     _COOLING_THRESHOLDS, lambda v: v, lambda v: v*10),
+    "vacuum_pressure": ("真空壓力", "🔘 真空壓力", "{:.1e} Torr", "正常: < 1e-6 Torr",
+                        _VACUUM_THRESHOLDS, lambda v: v*1e6, lambda v: min(v*1e7, 100)),
+    "light_intensity": ("光源強度", "💡 光源強度", "{}%", "正常: 90-110%",
+                        _LIGHT_THRESHOLDS, lambda v: v, lambda v: v),
+    "x_error": ("X軸誤差", "↔️ X軸誤差", "{:+d} nm", "正常: ±50 nm",
+                _ALIGNMENT_THRESHOLDS, abs, lambda v: min(abs(v), 100)),
+    "y_error": ("Y軸誤差", "↕️ Y軸誤差", "{:+d} nm", "正常: ±50 nm",
+                _ALIGNMENT_THRESHOLDS, abs, lambda v: min(abs(v), 100)),
+}
+
+
+@functools.lru_cache(maxsize=128, typed=True)
+def _render_card(param: str, value) -> str:
+    """代換單張參數卡片（只有一個參數改變時，其餘卡片直接命中快取）"""
+    comment, label, value_format, normal, thresholds, compare, width = _CARD_SPECS[param]
+    return _CARD_TMPL.format(
+        comment=comment,
+        label=label,
+        value=value_format.format(value),
+        color=_param_color(compare(value), thresholds),
+        width=width(value),
+        normal=normal,
+    )
+
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _render_parameter_display(lens_temp, cooling_flow, vacuum_pressure,
+                              light_intensity, x_error, y_error) -> str:
+    """組合參數儀表板（參數值由故障／修復動作設定，狀態種類有限，重複時直接命中快取）"""
+    return _PARAMETER_DISPLAY_TMPL.format(cards="".join((
+        _render_card("lens_temp", lens_temp),
+        _render_card("cooling_flow", cooling_flow),
+        _render_card("vacuum_pressure", vacuum_pressure),
+        _render_card("light_intensity", light_intensity),
+        _render_card("x_error", x_error),
+        _render_card("y_error", y_error),
+    )))
 
-            <!-- 光源強度 -->
-            <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">💡 光源強度</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(light_intensity, 90, 110)};">{light_intensity}%</span>
-                </div>
-                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(light_intensity, 90, 110)}; height: 100%; width: {light_intensity}%; transition: all 0.3s;"></div>
-                </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: 90-110%</div>
-            </div>
 
-            <!-- X軸誤差 -->
-            <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">↔️ X軸誤差</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(abs(x_error), 0, 50)};">{x_error:+d} nm</span>
-                </div>
-                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(abs(x_error), 0, 50)}; height: 100%; width: {min(abs(x_error), 100)}%; transition: all 0.3s;"></div>
-                </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: ±50 nm</div>
-            </div>
+def get_parameter_display_html(params: Dict) -> str:
+    """生成參數儀表板 HTML"""
+    return _render_parameter_display(
+        params.get("lens_temp", 450),
+        params.get("cooling_flow", 5.0),
+        params.get("vacuum_pressure", 1e-6),
+        params.get("light_intensity", 100),
+        params.get("x_error", 0),
+        params.get("y_error", 0),
+    )
 
-            <!-- Y軸誤差 -->
-            <div style="background: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 14px;">↕️ Y軸誤差</span>
-                    <span style="font-size: 20px; font-weight: bold; color: {get_color(abs(y_error), 0, 50)};">{y_error:+d} nm</span>
-                </div>
-                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                    <div style="background: {get_color(abs(y_error), 0, 50)}; height: 100%; width: {min(abs(y_error), 100)}%; transition: all 0.3s;"></div>
-                </div>
-                <div style="font-size: 11px; color: #666; margin-top: 5px;">正常: ±50 nm</div>
-            </div>
 
-        </div>
-    </div>
+# ===== 訊息紀錄 =====
+
+# (整數秒, "HH:MM:SS")：同一秒內的動作共用同一個時間字串
+_last_hms = (0, "")
+
+
+def _now_hms() -> str:
+    """目前時間 HH:MM:SS（每秒只格式化一次）"""
+    global _last_hms
+    second = int(time.time())
+    cached_second, text = _last_hms
+    if second != cached_second:
+        text = time.strftime("%H:%M:%S", time.localtime(second))
+        _last_hms = (second, text)
+    return text
+
+
+class _MessageLog:
+    """
+    訊息紀錄：最多保留 maxlen 筆，並同步維護合併後的文字
+
+    每次新增只接上新的一筆（已滿時切掉最舊的一筆），
+    不必每次點擊都重新 join 整個列表，長時間訓練也不會無限成長
     """
-    return html
+
+    def __init__(self, maxlen: int = 200):
+        self._entries = deque(maxlen=maxlen)
+        self.text = ""
+
+    def clear(self):
+        self._entries.clear()
+        self.text = ""
+
+    def append(self, entry: str):
+        if len(self._entries) == self._entries.maxlen:
+            # 最舊一筆連同其後的換行一起移除
+            self.text = self.text[len(self._entries[0]) + 1:]
+
+        self._entries.append(entry)
+        self.text = f"{self.text}\n{entry}" if len(self._entries) > 1 else entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 # ===== 訓練邏輯類別 =====
 
+# 故障類型 → 初始警報訊息
+_ALERTS = {
+    "temperature_spike": "機台溫度過高！目前 500°C（正常 450°C）",
+    "vacuum_leak": "真空系統異常！壓力 1e-3 Torr（正常 < 1e-6）",
+    "alignment_drift": "對準系統漂移！X軸 +120nm, Y軸 -80nm",
+    "optical_intensity_drop": "光源強度不足！目前 70%（正常 100%）",
+    "electrical_fluctuation": "電氣系統波動！光源不穩定"
+}
+
 class VisualTrainingSystem:
     """視覺化訓練系統"""
 
@@ -227,18 +344,30 @@ class VisualTrainingSystem:
             "x_error": 0,
             "y_error": 0
         }
-        self.fault_status = {
-            "lens_fault": False,
-            "wafer_fault": False,
-            "stage_fault": False,
-            "cooling_fault": False,
-            "vacuum_fault": False
+        self.fault_bits = 0  # _LENS_FAULT | _COOLING_FAULT ... 的組合
+        self.messages = _MessageLog()
+        self.action_log = _MessageLog()
+
+        # 動作名稱 → 處理函式（未列出的動作只記錄執行）
+        self._action_handlers = {
+            "檢查冷卻水系統": self._check_cooling,
+            "調整冷卻水流量": self._adjust_cooling,
+            "更換過濾網": self._replace_filter,
+            "檢查真空系統": self._check_vacuum,
+            "修復真空密封": self._repair_vacuum_seal,
+            "執行對準校正": self._calibrate_alignment,
+            "清潔光學鏡片": self._clean_lens,
+            "調整光源強度": self._adjust_light_source,
+            "詢問診斷專家": self._ask_expert,
         }
-        self.messages = []
-        self.action_log = []
 
         print("[OK] System ready!")
 
+    @property
+    def fault_status(self) -> Dict[str, bool]:
+        """各部件故障狀態（由 fault_bits 展開，供外部讀取）"""
+        return {key: bool(self.fault_bits & bit) for key, bit in _FAULT_BITS.items()}
+
     def start_scenario(self, difficulty: str):
         """開始新情境"""
         # 生成情境
@@ -254,13 +383,14 @@ class VisualTrainingSystem:
 
         # 初始警報
         alert = self._get_alert_message(fault_type)
-        self.messages = [f"[SYSTEM ALERT] {alert}"]
-        self.action_log = []
+        self.messages.clear()
+        self.messages.append(f"[SYSTEM ALERT] {alert}")
+        self.action_log.clear()
 
         return (
-            get_equipment_diagram_html(self.fault_status),
+            get_equipment_state_html(self.fault_bits),
             get_parameter_display_html(self.parameters),
-            "\n".join(self.messages),
+            self.messages.text,
             ""
         )
 
@@ -269,140 +399,150 @@ class VisualTrainingSystem:
         if fault_type == "temperature_spike":
             self.parameters["lens_temp"] = 500
             self.parameters["cooling_flow"] = 2.5
-            self.fault_status["lens_fault"] = True
-            self.fault_status["cooling_fault"] = True
+            self.fault_bits |= _LENS_FAULT | _COOLING_FAULT
 
         elif fault_type == "vacuum_leak":
             self.parameters["vacuum_pressure"] = 1e-3
-            self.fault_status["vacuum_fault"] = True
+            self.fault_bits |= _VACUUM_FAULT
 
         elif fault_type == "alignment_drift":
             self.parameters["x_error"] = 120
             self.parameters["y_error"] = -80
-            self.fault_status["stage_fault"] = True
+            self.fault_bits |= _STAGE_FAULT
 
         elif fault_type == "optical_intensity_drop":
             self.parameters["light_intensity"] = 70
-            self.fault_status["lens_fault"] = True
+            self.fault_bits |= _LENS_FAULT
 
         elif fault_type == "electrical_fluctuation":
             self.parameters["light_intensity"] = 85
-            self.fault_status["lens_fault"] = True
+            self.fault_bits |= _LENS_FAULT
 
     def _get_alert_message(self, fault_type: str) -> str:
         """取得警報訊息"""
-        alerts = {
-            "temperature_spike": "機台溫度過高！目前 500°C（正常 450°C）",
-            "vacuum_leak": "真空系統異常！壓力 1e-3 Torr（正常 < 1e-6）",
-            "alignment_drift": "對準系統漂移！X軸 +120nm, Y軸 -80nm",
-            "optical_intensity_drop": "光源強度不足！目前 70%（正常 100%）",
-            "electrical_fluctuation": "電氣系統波動！光源不穩定"
-        }
-        return alerts.get(fault_type, "設備異常！")
+        return _ALERTS.get(fault_type, "設備異常！")
 
     def perform_action(self, action_name: str):
         """執行動作"""
+        # 示意圖與儀表板沒有變化時回傳 gr.update()，不重送 HTML
         if not self.current_scenario:
             return (
-                get_equipment_diagram_html(self.fault_status),
-                get_parameter_display_html(self.parameters),
+                gr.update(),
+                gr.update(),
                 "請先開始新情境！",
                 ""
             )
 
+        fault_bits = self.fault_bits
+        dashboard = get_parameter_display_html(self.parameters)
+
         # 記錄動作
-        self.action_log.append(f"[{datetime.now().strftime('%H:%M:%S')}] {action_name}")
+        self.action_log.append(f"[{_now_hms()}] {action_name}")
 
         # 根據動作更新系統狀態
         response = self._process_action(action_name)
         self.messages.append(f"\n[YOU] {action_name}")
         self.messages.append(f"[SYSTEM] {response}")
 
+        new_dashboard = get_parameter_display_html(self.parameters)
+
         return (
-            get_equipment_diagram_html(self.fault_status),
-            get_parameter_display_html(self.parameters),
-            "\n".join(self.messages),
-            "\n".join(self.action_log)
+            gr.update() if self.fault_bits == fault_bits else get_equipment_state_html(self.fault_bits),
+            gr.update() if new_dashboard == dashboard else new_dashboard,
+            self.messages.text,
+            self.action_log.text
         )
 
     def _process_action(self, action: str) -> str:
-        """處理動作並返回回應"""
+        """處理動作並返回回應（依按鈕名稱直接查表，不做關鍵字比對）"""
         fault_type = self.current_scenario["type"]
-
-        # 溫度相關動作
-        if "冷卻水" in action and "檢查" in action:
-            if fault_type == "temperature_spike":
-                return f"冷卻水流量異常！目前 {self.parameters['cooling_flow']} L/min（正常 5.0）"
-            return "冷卻水系統正常"
-
-        elif "冷卻水" in action and "調整" in action:
-            if fault_type == "temperature_spike":
-                # 發現過濾網堵塞
-                return "發現過濾網堵塞！需要更換"
-            return "冷卻水流量已調整"
-
-        elif "過濾網" in action or "更換" in action:
-            if fault_type == "temperature_spike":
-                # 修復
-                self.parameters["cooling_flow"] = 5.0
-                self.parameters["lens_temp"] = 450
-                self.fault_status["cooling_fault"] = False
-                self.fault_status["lens_fault"] = False
-                return "過濾網已更換！冷卻水流量恢復正常，溫度開始下降"
-            return "已更換過濾網"
-
-        # 真空相關動作
-        elif "真空" in action:
-            if fault_type == "vacuum_leak":
-                if "檢查" in action:
-                    return f"真空壓力異常！{self.parameters['vacuum_pressure']:.1e} Torr"
-                elif "修復" in action or "密封" in action:
-                    self.parameters["vacuum_pressure"] = 1e-6
-                    self.fault_status["vacuum_fault"] = False
-                    return "密封圈已更換！真空恢復正常"
-            return "真空系統運作中"
-
-        # 對準相關動作
-        elif "對準" in action or "校正" in action:
-            if fault_type == "alignment_drift":
-                self.parameters["x_error"] = 0
-                self.parameters["y_error"] = 0
-                self.fault_status["stage_fault"] = False
-                return "對準校正完成！誤差已修正"
-            return "對準系統正常"
-
-        # 光源相關動作
-        elif "光源" in action or "鏡片" in action:
-            if fault_type in ["optical_intensity_drop", "electrical_fluctuation"]:
-                if "清潔" in action:
-                    self.parameters["light_intensity"] = 95
-                    return "鏡片已清潔！光強度提升至 95%"
-                elif "調整" in action:
-                    self.parameters["light_intensity"] = 100
-                    self.fault_status["lens_fault"] = False
-                    return "光源已調整！強度恢復正常"
-            return "光源系統運作中"
-
-        # 診斷專家
-        elif "診斷專家" in action or "專家" in action:
-            equipment_state = self.digital_twin.export_current_state()
-            diagnosis = self.coordinator.start_diagnosis_session(equipment_state, "beginner")
-
-            fault = diagnosis["session_summary"]["fault_type"]
-            confidence = diagnosis["session_summary"]["confidence"]
-            recommendations = diagnosis["diagnosis"]["recommendations"]
-
-            response = f"[AI 診斷專家]\n故障類型: {fault}\n信心度: {confidence:.0%}\n\n建議:\n"
-            for rec in recommendations[:3]:
-                response += f"- {rec}\n"
-            return response
+        handler = self._action_handlers.get(action)
 
         # 其他動作
-        return f"執行: {action}"
+        if handler is None:
+            return f"執行: {action}"
+
+        return handler(fault_type)
+
+    # ----- 溫度相關動作 -----
+
+    def _check_cooling(self, fault_type: str) -> str:
+        if fault_type == "temperature_spike":
+            return f"冷卻水流量異常！目前 {self.parameters['cooling_flow']} L/min（正常 5.0）"
+        return "冷卻水系統正常"
+
+    def _adjust_cooling(self, fault_type: str) -> str:
+        if fault_type == "temperature_spike":
+            # 發現過濾網堵塞
+            return "發現過濾網堵塞！需要更換"
+        return "冷卻水流量已調整"
+
+    def _replace_filter(self, fault_type: str) -> str:
+        if fault_type == "temperature_spike":
+            # 修復
+            self.parameters["cooling_flow"] = 5.0
+            self.parameters["lens_temp"] = 450
+            self.fault_bits &= ~(_COOLING_FAULT | _LENS_FAULT)
+            return "過濾網已更換！冷卻水流量恢復正常，溫度開始下降"
+        return "已更換過濾網"
+
+    # ----- 真空相關動作 -----
+
+    def _check_vacuum(self, fault_type: str) -> str:
+        if fault_type == "vacuum_leak":
+            return f"真空壓力異常！{self.parameters['vacuum_pressure']:.1e} Torr"
+        return "真空系統運作中"
+
+    def _repair_vacuum_seal(self, fault_type: str) -> str:
+        if fault_type == "vacuum_leak":
+            self.parameters["vacuum_pressure"] = 1e-6
+            self.fault_bits &= ~_VACUUM_FAULT
+            return "密封圈已更換！真空恢復正常"
+        return "真空系統運作中"
+
+    # ----- 對準相關動作 -----
+
+    def _calibrate_alignment(self, fault_type: str) -> str:
+        if fault_type == "alignment_drift":
+            self.parameters["x_error"] = 0
+            self.parameters["y_error"] = 0
+            self.fault_bits &= ~_STAGE_FAULT
+            return "對準校正完成！誤差已修正"
+        return "對準系統正常"
+
+    # ----- 光源相關動作 -----
+
+    def _clean_lens(self, fault_type: str) -> str:
+        if fault_type in ["optical_intensity_drop", "electrical_fluctuation"]:
+            self.parameters["light_intensity"] = 95
+            return "鏡片已清潔！光強度提升至 95%"
+        return "光源系統運作中"
+
+    def _adjust_light_source(self, fault_type: str) -> str:
+        if fault_type in ["optical_intensity_drop", "electrical_fluctuation"]:
+            self.parameters["light_intensity"] = 100
+            self.fault_bits &= ~_LENS_FAULT
+            return "光源已調整！強度恢復正常"
+        return "光源系統運作中"
+
+    # ----- 診斷專家 -----
+
+    def _ask_expert(self, fault_type: str) -> str:
+        equipment_state = self.digital_twin.export_current_state()
+        diagnosis = self.coordinator.start_diagnosis_session(equipment_state, "beginner")
+
+        fault = diagnosis["session_summary"]["fault_type"]
+        confidence = diagnosis["session_summary"]["confidence"]
+        recommendations = diagnosis["diagnosis"]["recommendations"]
+
+        response = f"[AI 診斷專家]\n故障類型: {fault}\n信心度: {confidence:.0%}\n\n建議:\n"
+        for rec in recommendations[:3]:
+            response += f"- {rec}\n"
+        return response
 
     def get_operation_log(self):
         """取得操作記錄"""
-        return "\n".join(self.action_log)
+        return self.action_log.text
 
 
 # ===== Gradio 介面 =====
@@ -422,7 +562,8 @@ def create_visual_interface(secom_data_path: str):
         # 上方區域：機台圖 + 參數儀表板
         with gr.Row():
             with gr.Column(scale=1):
-                equipment_diagram = gr.HTML(get_equipment_diagram_html())
+                gr.HTML(_EQUIPMENT_SHELL_HTML)
+                equipment_state = gr.HTML(get_equipment_state_html())
 
             with gr.Column(scale=1):
                 parameter_dashboard = gr.HTML(get_parameter_display_html(system.parameters))
@@ -482,7 +623,7 @@ def create_visual_interface(secom_data_path: str):
         start_btn.click(
             fn=system.start_scenario,
             inputs=[difficulty],
-            outputs=[equipment_diagram, parameter_dashboard, system_messages, action_log]
+            outputs=[equipment_state, parameter_dashboard, system_messages, action_log]
         )
 
         # 操作按鈕
@@ -502,7 +643,7 @@ def create_visual_interface(secom_data_path: str):
         for btn, action_name in buttons:
             btn.click(
                 fn=lambda a=action_name: system.perform_action(a),
-                outputs=[equipment_diagram, parameter_dashboard, system_messages, action_log]
+                outputs=[equipment_state, parameter_dashboard, system_messages, action_log]
             )
 
     return demo
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+啟動腳本共用工具
+套件檢查與 SECOM 資料集搜尋
+"""
+
+import functools
+import importlib.util
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# 啟動訓練系統必要的套件
+REQUIRED_PACKAGES = ("pandas", "numpy", "gradio")
+
+# 指定 SECOM 資料集路徑的環境變數（設定後不再搜尋候選位置）
+SECOM_ENV = "SECOM_PATH"
+
+# SECOM 資料集的候選位置（依序搜尋）
+SECOM_CANDIDATES = (
+    "../uci-secom.csv",
+    "../../uci-secom.csv",
+    "data/uci-secom.csv",
+    "uci-secom.csv",
+    str(Path(__file__).parent / "uci-secom.csv"),  # 從其他目錄執行時，專案目錄中的資料集
+)
+
+
+def is_installed(package: str) -> bool:
+    """
+    檢查套件是否已安裝
+
+    只用 find_spec 找模組位置，不實際匯入（pandas／gradio 匯入要數百毫秒），
+    真正的匯入留給介面模組
+    """
+    return importlib.util.find_spec(package) is not None
+
+
+def find_missing_packages(packages: Iterable[str] = REQUIRED_PACKAGES) -> List[str]:
+    """
+    找出未安裝的套件
+
+    Args:
+        packages: 要檢查的套件名稱
+
+    Returns:
+        未安裝的套件列表
+    """
+    return [package for package in packages if not is_installed(package)]
+
+
+def ensure_dirs(*paths: str):
+    """
+    確保資料目錄存在
+
+    目錄已存在時（一般啟動的情況）只需一次 stat；
+    makedirs(exist_ok=True) 則一律先 stat 上層、嘗試 mkdir 再檢查
+
+    Args:
+        paths: 目錄路徑
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_secom(candidates: tuple = SECOM_CANDIDATES) -> Optional[str]:
+    """
+    搜尋 SECOM 資料集（同一程序內只搜尋一次）
+
+    有設定 SECOM_PATH 環境變數時直接使用，不做任何 stat
+
+    Args:
+        candidates: 候選路徑
+
+    Returns:
+        第一個存在的路徑，找不到為 None
+    """
+    env_path = os.environ.get(SECOM_ENV)
+    if env_path:
+        return env_path
+
+    for path in candidates:
+        try:
+            os.stat(path)  # 一次 stat 同時確認存在與可存取
+        except OSError:
+            continue
+        return path
+    return None
@@ -1,55 +1,83 @@
 # -*- coding: utf-8 -*-
 """
 簡易系統測試
+
+    python simple_test.py            # 全部測試
+    python simple_test.py --only=3   # 只跑第 3 項（不匯入其他項目的模組）
+
+測試依匯入成本排序：不需讀取 SECOM 資料的項目先跑，
+各項目的模組在該項目執行時才匯入
 """
 
+import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-print("\n" + "=" * 60)
-print("System Test - Semiconductor Training System")
-print("=" * 60)
+SECOM_PATH = os.environ.get("SECOM_PATH", "../uci-secom.csv")
 
-# Test 1: Digital Twin
-print("\nTest 1: Digital Twin...")
-try:
-    from core.digital_twin import LithographyDigitalTwin
-    twin = LithographyDigitalTwin("../uci-secom.csv")
-    summary = twin.get_all_sensors_summary()
-    print(f"[OK] Digital Twin - {summary['total_sensors']} sensors")
-except Exception as e:
-    print(f"[FAIL] Digital Twin - {e}")
 
-# Test 2: A2A System
-print("\nTest 2: A2A Coordinator...")
-try:
+def check_a2a_coordinator():
     from core.a2a_coordinator import A2ACoordinator
     coordinator = A2ACoordinator()
     print("[OK] A2A Coordinator")
-except Exception as e:
-    print(f"[FAIL] A2A Coordinator - {e}")
 
-# Test 3: Scenario Generator
-print("\nTest 3: Scenario Generator...")
-try:
-    from core.scenario_generator import ScenarioGenerator
-    generator = ScenarioGenerator("../uci-secom.csv")
-    scenario = generator.generate_scenario()
-    print(f"[OK] Scenario Generator - {scenario['type']}")
-except Exception as e:
-    print(f"[FAIL] Scenario Generator - {e}")
 
-# Test 4: Scoring System
-print("\nTest 4: Scoring System...")
-try:
+def check_scoring_system():
     from evaluation.scoring_system import ScoringSystem
     scorer = ScoringSystem()
     print("[OK] Scoring System")
-except Exception as e:
-    print(f"[FAIL] Scoring System - {e}")
 
-print("\n" + "=" * 60)
-print("Test Complete!")
-print("=" * 60)
+
+def check_digital_twin():
+    from core.digital_twin import LithographyDigitalTwin
+    twin = LithographyDigitalTwin(SECOM_PATH)
+    summary = twin.get_all_sensors_summary()
+    print(f"[OK] Digital Twin - {summary['total_sensors']} sensors")
+
+
+def check_scenario_generator():
+    from core.scenario_generator import ScenarioGenerator
+    generator = ScenarioGenerator(SECOM_PATH)
+    scenario = generator.generate_scenario()
+    print(f"[OK] Scenario Generator - {scenario['type']}")
+
+
+# (名稱, 測試函式)，依匯入成本由低到高
+CHECKS = [
+    ("A2A Coordinator", check_a2a_coordinator),
+    ("Scoring System", check_scoring_system),
+    ("Digital Twin", check_digital_twin),
+    ("Scenario Generator", check_scenario_generator),
+]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    only = None
+    for arg in argv:
+        if arg.startswith("--only="):
+            only = int(arg.split("=", 1)[1])
+
+    print("\n" + "=" * 60)
+    print("System Test - Semiconductor Training System")
+    print("=" * 60)
+
+    for number, (name, check) in enumerate(CHECKS, start=1):
+        if only is not None and number != only:
+            continue
+
+        print(f"\nTest {number}: {name}...")
+        try:
+            check()
+        except Exception as e:
+            print(f"[FAIL] {name} - {e}")
+
+    print("\n" + "=" * 60)
+    print("Test Complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@
 """
 
 from typing import Dict, List, Tuple, Optional
+import copy
 import json
 import requests
 import os
@@ -228,6 +229,17 @@ class LocalMentorBot:
         self.conversation_history = []
         print("[Info] 對話已重置，開始新的學習話題")
 
+    def fork(self) -> "LocalMentorBot":
+        """
+        建立另一個學員使用的 BOT（模型設定相同，對話歷史各自獨立）
+
+        Returns:
+            新的 LocalMentorBot
+        """
+        bot = copy.copy(self)
+        bot.conversation_history = []
+        return bot
+
     def get_model_info(self) -> Dict:
         """
         獲取當前模型資訊
@@ -4,6 +4,7 @@ Qwen Mentor Bot - 使用 Qwen 2.5 的學長導師
 整合 Qwen 2.5 3B Instruct 到訓練系統
 """
 
+import copy
 import sys
 import os
 from typing import Dict, List, Optional
@@ -159,6 +160,19 @@ class QwenMentorBot:
         """檢查 Bot 是否可用"""
         return self.is_ready
 
+    def fork(self) -> "QwenMentorBot":
+        """
+        建立另一個學員使用的 BOT（共用已載入的模型，不重新載入）
+
+        副本共用同一個訓練助手：生成回答時不帶入對話歷史，學員之間不會互相影響；
+        助手的統計與對話紀錄則是所有副本合計（紀錄只保留最近
+        MAX_HISTORY_MESSAGES 則），clear_conversation_history 也會清除共用的紀錄
+
+        Returns:
+            新的 QwenMentorBot
+        """
+        return copy.copy(self)
+
     def __del__(self):
         """清理資源"""
         # 清理 GPU 記憶體
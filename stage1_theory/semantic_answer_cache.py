@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+理論問答快取 (Semantic Answer Cache)
+學員常重複問同樣的問題，已回答過的問題直接回傳先前的回答，不必再呼叫 LLM
+
+比對方式：
+1. 正規化後完全相同的問題（忽略大小寫、空白、全形／半形與句尾標點）
+2. 安裝 sentence-transformers 時，另以多語言模型的問題向量比對，
+   餘弦相似度達門檻才視為同一問題
+
+未安裝嵌入模型時只做完全比對：字元 n-gram 之類的近似比對分不出
+「流量太低」與「流量太高」、「CVD」與「PVD」，會回傳意思相反的答案
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import re
+import threading
+import unicodedata
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
+
+
+# 句尾標點（正規化時去除）
+_TRAILING_PUNCT = re.compile(r"[\s?!.。？！~～]+$")
+
+
+def normalize_question(text: str) -> str:
+    """
+    正規化問題文字（完全比對用的鍵）
+
+    NFKC 將全形英數與標點轉為半形，再去除大小寫、空白與句尾標點
+
+    Args:
+        text: 問題文字
+
+    Returns:
+        正規化後的問題
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _TRAILING_PUNCT.sub("", text)
+    return "".join(text.split())
+
+
+class SemanticAnswerCache:
+    """
+    理論問答快取
+
+    特色：
+    1. 完全比對：正規化後的問題直接查字典
+    2. 語意比對（選用）：多語言嵌入模型＋嚴格門檻，所有已快取問題一次矩陣乘法求相似度
+    3. 容量上限：超過 max_entries 時淘汰最久未命中的項目 (LRU)
+    4. 執行緒安全：多個學員同時提問時共用同一份快取
+
+    只應快取與對話上下文無關的回答（例如學員對話的第一個問題），
+    帶上下文的回答取決於該學員先前的問答，不能給其他學員使用
+
+    使用範例：
+    ```python
+    cache = SemanticAnswerCache()
+
+    answer = cache.get("CVD 是什麼？")
+    if answer is None:
+        answer = bot.ask("CVD 是什麼？", maintain_context=False)
+        cache.put("CVD 是什麼？", answer)
+    ```
+    """
+
+    # 支援中文的多語言模型（all-MiniLM-L6-v2 只支援英文）
+    DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+    def __init__(self,
+                 embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+                 threshold: float = 0.95,
+                 max_entries: int = 5000):
+        """
+        初始化問答快取
+
+        Args:
+            embed_fn: 問題 → 正規化向量的函式（None 則在安裝 sentence-transformers 時
+                      使用 DEFAULT_MODEL，否則只做完全比對）
+            threshold: 語意比對視為同一問題的最低餘弦相似度
+            max_entries: 快取容量上限
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embed_fn = embed_fn
+        self._embed_ready = embed_fn is not None
+        self._model = None
+
+        # 完全比對：正規化問題 → 回答（LRU 順序）
+        self._exact: "OrderedDict[str, str]" = OrderedDict()
+
+        # 語意比對：向量矩陣第一次寫入時依維度配置，各列對應 _keys 中的問題
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._slots: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+    def _embedder(self) -> Optional[Callable[[str], np.ndarray]]:
+        """取得嵌入函式（第一次使用時才載入模型），沒有可用模型時為 None"""
+        if not self._embed_ready:
+            with self._lock:
+                if not self._embed_ready:
+                    self._embed_fn = self._default_embed_fn()
+                    self._embed_ready = True
+        return self._embed_fn
+
+    def _default_embed_fn(self) -> Optional[Callable[[str], np.ndarray]]:
+        """預設嵌入函式：sentence-transformers 多語言模型，未安裝或載入失敗時為 None"""
+        if not HAS_SENTENCE_TRANSFORMERS:
+            return None
+
+        try:
+            self._model = SentenceTransformer(self.DEFAULT_MODEL)
+            print(f"[OK] 問答快取使用 {self.DEFAULT_MODEL} 語意比對")
+            return lambda text: self._model.encode(text, normalize_embeddings=True)
+        except Exception as e:
+            print(f"[Warning] 嵌入模型載入失敗: {e}，問答快取只做完全比對")
+            return None
+
+    def get(self, question: str) -> Optional[str]:
+        """
+        查詢相同（或語意相同）問題的回答
+
+        Args:
+            question: 學員問題
+
+        Returns:
+            快取的回答，未命中為 None
+        """
+        key = normalize_question(question)
+
+        with self._lock:
+            answer = self._exact.get(key)
+            if answer is not None:
+                self._exact.move_to_end(key)
+                return answer
+
+        embed = self._embedder()
+        if embed is None:
+            return None
+
+        vector = np.asarray(embed(question), dtype=np.float32)
+
+        with self._lock:
+            count = len(self._keys)
+            if not count:
+                return None
+
+            similarities = self._vectors[:count] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            best_key = self._keys[best]
+            self._exact.move_to_end(best_key)
+            return self._exact[best_key]
+
+    def put(self, question: str, answer: str):
+        """
+        加入問答（已滿時淘汰最久未使用的項目）
+
+        Args:
+            question: 學員問題
+            answer: 回答
+        """
+        key = normalize_question(question)
+        embed = self._embedder()
+        vector = np.asarray(embed(question), dtype=np.float32) if embed is not None else None
+
+        with self._lock:
+            if key not in self._exact and len(self._exact) >= self.max_entries:
+                evicted, _ = self._exact.popitem(last=False)
+                slot = self._slots.pop(evicted, None)
+            else:
+                slot = self._slots.get(key)
+
+            self._exact[key] = answer
+            self._exact.move_to_end(key)
+
+            if vector is None:
+                return
+
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            if slot is None:
+                slot = len(self._keys)
+                self._keys.append(key)
+            else:
+                self._keys[slot] = key
+
+            self._vectors[slot] = vector
+            self._slots[key] = slot
+
+    def __len__(self) -> int:
+        return len(self._exact)
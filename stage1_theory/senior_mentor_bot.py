@@ -6,6 +6,7 @@
 
 from typing import Dict, List, Tuple, Optional
 import anthropic
+import copy
 import os
 
 
@@ -182,6 +183,17 @@ class SeniorMentorBot:
         """重置對話歷史"""
         self.conversation_history = []
 
+    def fork(self) -> "SeniorMentorBot":
+        """
+        建立另一個學員使用的 BOT（共用 API client，對話歷史各自獨立）
+
+        Returns:
+            新的 SeniorMentorBot
+        """
+        bot = copy.copy(self)
+        bot.conversation_history = []
+        return bot
+
     def get_conversation_summary(self) -> str:
         """獲取對話摘要"""
         if not self.conversation_history:
@@ -1,77 +1,236 @@
 # -*- coding: utf-8 -*-
 """
 Simple startup script without emoji (Windows compatible)
+
+共用啟動入口：
+    python start.py                 # 基本訓練介面 (gradio)
+    python start.py interactive     # 互動式訓練介面
+    python start.py visual          # 視覺化訓練介面
+    python start.py simulation      # 情境模擬訓練（自然語言操作 + AI 學長）
+    python start.py unified         # 整合訓練系統（理論學習 + 實作訓練）
+    python start.py firstperson     # Virtual Fab 第一人稱遊戲
+    python start.py visual --port 7861
+    python start.py visual --dataset /data/uci-secom.csv
 """
 
-import os
+import argparse
+import importlib
 import sys
+import tempfile
+from collections import namedtuple
 from pathlib import Path
 
-def main():
-    print("=" * 60)
-    print("Semiconductor Equipment Training System")
-    print("=" * 60)
-    print()
+from launcher_common import REQUIRED_PACKAGES, ensure_dirs, find_missing_packages, resolve_secom
+
+_PROJECT_DIR = Path(__file__).parent
+_STATIC_DIR = str(_PROJECT_DIR / "static")
+
+# 橫幅分隔線與成功訊息（匯入時建立一次）
+_BAR = "=" * 60
+_SUCCESS_BANNER = (_BAR, "[SUCCESS] System started!", _BAR, "")
+
+# 啟動模式
+#   module / factory: 介面模組與建立函式（檢查通過後才匯入，只載入選定的介面）
+#   title / notes: 標題與啟動後說明
+#   port: 預設 port（None 自動尋找）
+#   allowed_paths: 允許 Gradio 提供的本機目錄；allow_tempdir 另外允許系統暫存目錄
+#   data_dirs: 啟動前建立的資料目錄
+#   self_hosted: 介面自行在 127.0.0.1 啟動伺服器（建立函式接收 port，回傳物件帶有實際網址 url），
+#                不支援 --host
+Mode = namedtuple(
+    "Mode",
+    ["module", "factory", "title", "notes", "port", "allowed_paths", "allow_tempdir", "data_dirs",
+     "self_hosted"],
+    defaults=((), None, (), False, (), False),
+)
+
+MODES = {
+    "gradio": Mode(
+        "interface.gradio_app", "create_interface",
+        "Semiconductor Equipment Training System",
+    ),
+    "interactive": Mode(
+        "interface.interactive_training", "create_interactive_interface",
+        "Interactive Semiconductor Training System",
+        notes=("Open browser and start training!",),
+    ),
+    "visual": Mode(
+        "interface.visual_training_interface", "create_visual_interface",
+        "Visual Semiconductor Training System",
+        notes=(
+            "Features:",
+            "  - Interactive equipment diagram",
+            "  - Real-time parameter monitoring",
+            "  - Click buttons to perform actions",
+            "  - AI expert consultation",
+        ),
+    ),
+    "simulation": Mode(
+        "interface.simulation_interface", "create_simulation_interface",
+        "Semiconductor Fault Handling Simulation Training",
+        notes=(
+            "Features:",
+            "  - Natural language input",
+            "  - Real-time fault progression",
+            "  - Dynamic equipment visualization",
+            "  - AI 情境學長 - 像學長般自然引導！",
+            "  - Automatic evaluation",
+            "",
+            "AI 學長模式:",
+            "  - 支援本地 LLM (Qwen/Ollama) 或 Claude API",
+            "  - 自然對話，就像學長在旁邊一起處理",
+            "  - 會反問、引導思考，不直接給答案",
+            "  - 適時給予肯定和建議",
+            "",
+            "Example inputs (支援口語化表達!):",
+            "  正式： 檢查冷卻水流量",
+            "  口語： 冷卻水怎麼樣 / 看一下冷卻水 / 流量正常嗎",
+            "",
+            "  正式： 詢問專家為什麼溫度上升",
+            "  口語： 學長，為什麼溫度一直上升 / 問一下該怎麼辦",
+            "",
+            "  正式： 停機更換過濾網",
+            "  口語： 先停一下 / 換過濾網 / 換個新的",
+            "",
+            "Open your browser and start training!",
+        ),
+        port=7860,
+        allowed_paths=(_STATIC_DIR,),
+        allow_tempdir=True,
+    ),
+    "unified": Mode(
+        "interface.unified_training_interface", "create_unified_interface",
+        "Integrated Semiconductor Training System\nTheory Learning + Practice Training",
+        notes=(
+            "System Features:",
+            "  Stage 1: Theory Learning",
+            "    - Theory BOT Q&A",
+            "    - Knowledge Tests",
+            "    - Must pass 70+ to unlock Stage 2",
+            "",
+            "  Stage 2: Practice Training",
+            "    - Real fault scenarios",
+            "    - Natural language operations",
+            "    - AI expert guidance",
+            "    - Must score 80+ to complete",
+            "",
+            "  Learning Report:",
+            "    - Performance statistics",
+            "    - Learning curves",
+            "    - Knowledge gaps analysis",
+            "    - Improvement recommendations",
+            "",
+            "Open your browser and start training!",
+        ),
+        allowed_paths=(_STATIC_DIR,),
+        data_dirs=("data/student_progress", "data/sop_documents"),
+    ),
+    # 遊戲伺服器由 start_game 自行啟動（port 被占用時往後找），launch() 只開啟瀏覽器並等待 Ctrl+C
+    "firstperson": Mode(
+        "interface.first_person_interface", "create_firstperson_interface",
+        "  Virtual Fab — ASML 第一人稱遊戲訓練系統",
+        notes=(
+            "  操作說明:",
+            "    WASD      — 移動",
+            "    滑鼠      — 旋轉視角（點擊畫面鎖定）",
+            "    E         — 檢查靠近的設備部件",
+            "    C         — 與 AI 學長對話",
+            "    ESC       — 暫停 / 解鎖滑鼠",
+            "",
+        ),
+        port=8765,
+        data_dirs=("data/student_progress",),
+        self_hosted=True,
+    ),
+}
+
+
+def _write(*lines):
+    """一次寫出多行（整段訊息一次 write，不逐行 print）"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="Semiconductor Equipment Training System")
+    parser.add_argument("mode", nargs="?", default="gradio", choices=MODES,
+                        help="要啟動的介面（預設 gradio）")
+    parser.add_argument("--host", default=None, help="伺服器位址（預設 127.0.0.1）")
+    parser.add_argument("--port", type=int, default=None,
+                        help="伺服器 port（預設自動尋找可用 port）")
+    parser.add_argument("--dataset", default=None,
+                        help="SECOM 資料集路徑（預設讀取 SECOM_PATH 環境變數或搜尋常見位置）")
+    args = parser.parse_args(argv)
+
+    if MODES[args.mode].self_hosted and args.host not in (None, "127.0.0.1"):
+        parser.error(f"{args.mode} 模式的伺服器只在 127.0.0.1 提供，不支援 --host")
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mode = MODES[args.mode]
+    port = args.port if args.port is not None else mode.port
 
     # Check packages
-    print("Checking packages...")
-    required = ['pandas', 'numpy', 'gradio']
-    missing = []
-
-    for pkg in required:
-        try:
-            __import__(pkg)
-            print(f"  [OK] {pkg}")
-        except ImportError:
-            print(f"  [FAIL] {pkg}")
-            missing.append(pkg)
+    missing = find_missing_packages()
+    header = [_BAR, mode.title, _BAR, "", "Checking packages..."]
+    header += [f"  [FAIL] {pkg}" if pkg in missing else f"  [OK] {pkg}"
+               for pkg in REQUIRED_PACKAGES]
 
     if missing:
-        print(f"\nMissing packages: {', '.join(missing)}")
-        print("Run: pip install pandas numpy gradio")
+        _write(*header,
+               f"\nMissing packages: {', '.join(missing)}",
+               "Run: pip install pandas numpy gradio")
         sys.exit(1)
 
-    print("[OK] All packages installed\n")
-
     # Check data
-    print("Checking dataset...")
-    paths = ["../uci-secom.csv", "../../uci-secom.csv", "uci-secom.csv"]
-    secom_path = None
-
-    for path in paths:
-        if os.path.exists(path):
-            print(f"  [OK] Found: {path}\n")
-            secom_path = path
-            break
+    secom_path = args.dataset or resolve_secom()
 
     if not secom_path:
-        print("  [FAIL] Cannot find uci-secom.csv")
-        print("\nPlease download from Kaggle and place it in project directory")
+        _write(*header, "[OK] All packages installed\n",
+               "Checking dataset...",
+               "  [FAIL] Cannot find uci-secom.csv",
+               "\nPlease download from Kaggle and place it in project directory")
         sys.exit(1)
 
     # Start system
-    print("Starting training system...\n")
+    _write(*header, "[OK] All packages installed\n",
+           "Checking dataset...", f"  [OK] Found: {secom_path}\n",
+           "Starting training system...\n")
 
     try:
-        sys.path.insert(0, str(Path(__file__).parent))
-        from interface.gradio_app import create_interface
+        sys.path.insert(0, str(_PROJECT_DIR))
+
+        ensure_dirs(*mode.data_dirs)
+
+        create = getattr(importlib.import_module(mode.module), mode.factory)
+
+        if mode.self_hosted:
+            demo = create(secom_path, port=port)
+            url = demo.url
+        else:
+            demo = create(secom_path)
+            url = f"http://localhost:{port or 7860}"
 
-        demo = create_interface(secom_path)
+        _write(*_SUCCESS_BANNER,
+               f"Open browser: {url}",
+               *mode.notes,
+               "Press Ctrl+C to stop", "")
 
-        print("=" * 60)
-        print("[SUCCESS] System started!")
-        print("=" * 60)
-        print()
-        print("Open browser: http://localhost:7860")
-        print("Press Ctrl+C to stop")
-        print()
+        allowed_paths = list(mode.allowed_paths)
+        if mode.allow_tempdir:
+            allowed_paths.append(tempfile.gettempdir())
 
         demo.launch(
-            server_name="127.0.0.1",
-            server_port=None,  # 自動尋找可用 port
+            server_name=args.host or "127.0.0.1",
+            server_port=port,  # None 時自動尋找可用 port
             share=False,
             show_error=True,
-            quiet=False
+            quiet=False,
+            allowed_paths=allowed_paths
         )
 
     except Exception as e:
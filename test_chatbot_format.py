@@ -8,14 +8,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from launcher_common import resolve_secom
 from interface.simulation_interface import SimulationTrainingSystem
 
 # 找資料集
-secom_path = None
-for path in ["../uci-secom.csv", "../../uci-secom.csv", "uci-secom.csv"]:
-    if Path(path).exists():
-        secom_path = path
-        break
+secom_path = resolve_secom()
 
 if not secom_path:
     print("[ERROR] 找不到 uci-secom.csv")
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+測試多步驟輸入的拆分：每行一個步驟，句中的分號不拆開
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from interface.simulation_interface import _split_steps
+
+
+def test_single_sentence_with_semicolon():
+    """含分號的單一句子（如詢問學長）維持一個步驟"""
+    assert _split_steps("溫度升高；該怎麼辦？") == ["溫度升高；該怎麼辦？"]
+    assert _split_steps("流量偏低; 要先停機嗎") == ["流量偏低; 要先停機嗎"]
+
+
+def test_newline_separated_steps():
+    """換行分隔的多個步驟依序拆開，略過空行"""
+    steps = _split_steps("檢查冷卻水流量\n\n停機\n  \n更換過濾網\n")
+    assert steps == ["檢查冷卻水流量", "停機", "更換過濾網"]
+
+
+def test_single_step():
+    """單一步驟原樣回傳"""
+    assert _split_steps("檢查冷卻水流量") == ["檢查冷卻水流量"]
+    assert _split_steps("   ") == []
+
+
+if __name__ == "__main__":
+    test_single_sentence_with_semicolon()
+    test_newline_separated_steps()
+    test_single_step()
+    print("[OK] 多步驟輸入拆分測試通過")
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+測試理論問答快取：意思相反或不同的相近問題不得命中
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from stage1_theory import semantic_answer_cache
+from stage1_theory.semantic_answer_cache import SemanticAnswerCache, normalize_question
+
+
+# 字面相近但意思不同的問題（答案不可互用）
+NEAR_MISS_PAIRS = [
+    ("冷卻水流量太低會造成什麼影響？", "冷卻水流量太高會造成什麼影響？"),
+    ("鏡頭溫度會升高的原因是什麼？", "鏡頭溫度會降低的原因是什麼？"),
+    ("What is the purpose of CVD?", "What is the purpose of PVD?"),
+    ("真空壓力太高怎麼辦", "真空壓力太低怎麼辦"),
+]
+
+
+def exact_only_cache(**kwargs) -> SemanticAnswerCache:
+    """建立未安裝嵌入模型時的快取（只做完全比對）"""
+    with mock.patch.object(semantic_answer_cache, "HAS_SENTENCE_TRANSFORMERS", False):
+        cache = SemanticAnswerCache(**kwargs)
+        cache.get("")  # 在 patch 範圍內決定嵌入函式
+    return cache
+
+
+def test_near_miss_pairs_do_not_hit():
+    """近似但意思不同的問題不會取得對方的回答"""
+    cache = exact_only_cache()
+
+    for question, other in NEAR_MISS_PAIRS:
+        cache.put(question, f"answer: {question}")
+        assert cache.get(other) is None, other
+        assert cache.get(question) == f"answer: {question}"
+
+
+def test_normalized_exact_match():
+    """大小寫、空白、全形／半形與句尾標點不同仍視為同一問題"""
+    cache = exact_only_cache()
+    cache.put("What is CVD?", "CVD 是化學氣相沉積")
+
+    assert cache.get("what is cvd") == "CVD 是化學氣相沉積"
+    assert cache.get("  What  is ＣＶＤ？ ") == "CVD 是化學氣相沉積"
+    assert normalize_question("溫度升高；該怎麼辦？") == "溫度升高;該怎麼辦"
+
+
+def test_semantic_threshold():
+    """注入嵌入函式時，相似度未達門檻不命中，達門檻才命中"""
+    vectors = {
+        "流量太低的影響": np.array([1.0, 0.0, 0.0]),
+        "流量太高的影響": np.array([0.9, 0.435889894, 0.0]),   # 相似度 0.90
+        "流量過低的影響": np.array([0.98, 0.198997487, 0.0]),  # 相似度 0.98
+    }
+    cache = SemanticAnswerCache(embed_fn=vectors.__getitem__, threshold=0.95)
+    cache.put("流量太低的影響", "low")
+
+    assert cache.get("流量太高的影響") is None
+    assert cache.get("流量過低的影響") == "low"
+
+
+def test_lru_capacity():
+    """超過容量時淘汰最久未使用的問題"""
+    cache = exact_only_cache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_lru_capacity_with_embeddings():
+    """語意比對時淘汰的問題不再被相似度比對命中"""
+    vectors = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 1.0]), "c": np.array([0.6, 0.8])}
+    cache = SemanticAnswerCache(embed_fn=vectors.__getitem__, threshold=0.95, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.put("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+    assert cache.get("c") == "C"
+
+
+if __name__ == "__main__":
+    test_near_miss_pairs_do_not_hit()
+    test_normalized_exact_match()
+    test_semantic_threshold()
+    test_lru_capacity()
+    test_lru_capacity_with_embeddings()
+    print("[OK] 問答快取測試通過")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+測試學員工作階段存放區：存取更新、閒置釋放、釋放後重建
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from integration.session_store import SessionStore
+
+
+class FakeClock:
+    """可手動前進的 time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_store(clock, idle_ttl=60):
+    """建立存放區，回傳 (store, 建立次數列表, 已釋放的工作階段列表)"""
+    created = []
+    evicted = []
+
+    def factory(student_id):
+        created.append(student_id)
+        return {"student_id": student_id, "serial": len(created)}
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        store = SessionStore(factory, idle_ttl=idle_ttl, on_evict=evicted.append)
+    return store, created, evicted
+
+
+def test_touch_reuses_session():
+    """同一鍵重複存取取得同一份工作階段，不重新建立"""
+    clock = FakeClock()
+    store, created, _ = make_store(clock)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        first = store.touch("S001", "S001")
+        second = store.touch("S001", "S001")
+
+    assert first is second
+    assert created == ["S001"]
+    assert store.touch("", "S001") is None
+    assert store.touch("S001", "") is None
+
+
+def test_touch_refreshes_last_access():
+    """持續存取的工作階段不會因閒置逾時被釋放"""
+    clock = FakeClock()
+    store, _, evicted = make_store(clock, idle_ttl=60)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        store.touch("S001", "S001")
+        clock.now += 50
+        store.touch("S001", "S001")
+        clock.now += 50
+        assert store.evict_idle() == 0
+
+    assert evicted == []
+    assert len(store) == 1
+
+
+def test_evict_idle_calls_on_evict():
+    """閒置逾時的工作階段被釋放，並先呼叫 on_evict"""
+    clock = FakeClock()
+    store, _, evicted = make_store(clock, idle_ttl=60)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        idle = store.touch("S001", "S001")
+        clock.now += 30
+        active = store.touch("S002", "S002")
+        clock.now += 40
+        assert store.evict_idle() == 1
+
+    assert evicted == [idle]
+    assert len(store) == 1
+    assert active not in evicted
+
+
+def test_rebuild_after_eviction():
+    """已釋放的工作階段在下次存取時重建"""
+    clock = FakeClock()
+    store, created, _ = make_store(clock, idle_ttl=60)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        first = store.touch("S001", "S001")
+        clock.now += 61
+        store.evict_idle()
+        rebuilt = store.touch("S001", "S001")
+
+    assert rebuilt is not first
+    assert rebuilt["serial"] == 2
+    assert created == ["S001", "S001"]
+
+
+def test_sweep_runs_on_access():
+    """一般存取超過 SWEEP_INTERVAL 後順便釋放閒置的工作階段"""
+    clock = FakeClock()
+    store, _, evicted = make_store(clock, idle_ttl=60)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        idle = store.touch("S001", "S001")
+
+        # 未到清理間隔：即使已閒置逾時也不掃描
+        clock.now += SessionStore.SWEEP_INTERVAL - 1
+        store.touch("S002", "S002")
+        assert evicted == []
+
+        clock.now += 2
+        store.touch("S002", "S002")
+
+    assert evicted == [idle]
+    assert len(store) == 1
+
+
+def test_open_releases_replaced_session():
+    """open 取代同一鍵的工作階段時，舊的工作階段先呼叫 on_evict"""
+    clock = FakeClock()
+    store, _, evicted = make_store(clock)
+
+    with mock.patch("integration.session_store.time.monotonic", clock):
+        old = store.touch("S001", "S001")
+        new = store.open("S001", "S001")
+
+    assert new is not old
+    assert evicted == [old]
+    assert len(store) == 1
+
+
+if __name__ == "__main__":
+    test_touch_reuses_session()
+    test_touch_refreshes_last_access()
+    test_evict_idle_calls_on_evict()
+    test_rebuild_after_eviction()
+    test_sweep_runs_on_access()
+    test_open_releases_replaced_session()
+    print("[OK] 工作階段存放區測試通過")
@@ -3,12 +3,54 @@
 驗證所有模組是否正常運作
 """
 
+import functools
+import os
 import sys
+import traceback
 from pathlib import Path
 
 # 添加路徑
 sys.path.insert(0, str(Path(__file__).parent))
 
+SECOM_PATH = os.environ.get("SECOM_PATH", "../uci-secom.csv")
+
+# 設定 QUIET_TESTS=1 時失敗只顯示錯誤訊息，不輸出 traceback
+QUIET_TESTS = bool(os.environ.get("QUIET_TESTS"))
+
+
+def report_failure(e: Exception):
+    """顯示測試失敗（traceback 先格式化成一段字串，一次寫出）"""
+    print(f"❌ 測試失敗: {e}")
+    if not QUIET_TESTS:
+        sys.stdout.flush()  # 與 stderr 交錯時維持輸出順序
+        sys.stderr.write(traceback.format_exc())
+
+
+# 共用元件：各測試第一次使用時建立，之後重複使用（數位孿生以 reset() 還原狀態）
+
+@functools.lru_cache(maxsize=None)
+def get_twin():
+    from core.digital_twin import LithographyDigitalTwin
+    return LithographyDigitalTwin(SECOM_PATH)
+
+
+@functools.lru_cache(maxsize=None)
+def get_generator():
+    from core.scenario_generator import ScenarioGenerator
+    return ScenarioGenerator(SECOM_PATH)
+
+
+@functools.lru_cache(maxsize=None)
+def get_coordinator():
+    from core.a2a_coordinator import A2ACoordinator
+    return A2ACoordinator()
+
+
+@functools.lru_cache(maxsize=None)
+def get_scorer():
+    from evaluation.scoring_system import ScoringSystem
+    return ScoringSystem()
+
 def test_digital_twin():
     """測試數位孿生模擬器"""
     print("\n" + "=" * 60)
@@ -16,9 +58,8 @@ def test_digital_twin():
     print("=" * 60)
 
     try:
-        from core.digital_twin import LithographyDigitalTwin
-
-        twin = LithographyDigitalTwin("../uci-secom.csv")
+        twin = get_twin()
+        twin.reset()
 
         # 測試基本功能
         summary = twin.get_all_sensors_summary()
@@ -39,9 +80,7 @@ def test_digital_twin():
         return True
 
     except Exception as e:
-        print(f"❌ 測試失敗: {e}")
-        import traceback
-        traceback.print_exc()
+        report_failure(e)
         return False
 
 def test_a2a_system():
@@ -51,9 +90,7 @@ def test_a2a_system():
     print("=" * 60)
 
     try:
-        from core.a2a_coordinator import A2ACoordinator
-
-        coordinator = A2ACoordinator()
+        coordinator = get_coordinator()
         print(f"✅ A2A 協調器初始化成功")
 
         # 測試診斷專家
@@ -74,9 +111,7 @@ def test_a2a_system():
         return True
 
     except Exception as e:
-        print(f"❌ 測試失敗: {e}")
-        import traceback
-        traceback.print_exc()
+        report_failure(e)
         return False
 
 def test_scenario_generator():
@@ -86,9 +121,7 @@ def test_scenario_generator():
     print("=" * 60)
 
     try:
-        from core.scenario_generator import ScenarioGenerator
-
-        generator = ScenarioGenerator("../uci-secom.csv")
+        generator = get_generator()
         print(f"✅ 情境生成器初始化成功")
 
         # 測試情境生成
@@ -107,9 +140,7 @@ def test_scenario_generator():
         return True
 
     except Exception as e:
-        print(f"❌ 測試失敗: {e}")
-        import traceback
-        traceback.print_exc()
+        report_failure(e)
         return False
 
 def test_scoring_system():
@@ -119,9 +150,7 @@ def test_scoring_system():
     print("=" * 60)
 
     try:
-        from evaluation.scoring_system import ScoringSystem
-
-        scorer = ScoringSystem()
+        scorer = get_scorer()
         print(f"✅ 評分系統初始化成功")
 
         # 模擬評分
@@ -159,9 +188,7 @@ def test_scoring_system():
         return True
 
     except Exception as e:
-        print(f"❌ 測試失敗: {e}")
-        import traceback
-        traceback.print_exc()
+        report_failure(e)
         return False
 
 def test_integration():
@@ -171,16 +198,12 @@ def test_integration():
     print("=" * 60)
 
     try:
-        from core.digital_twin import LithographyDigitalTwin
-        from core.a2a_coordinator import A2ACoordinator
-        from core.scenario_generator import ScenarioGenerator
-        from evaluation.scoring_system import ScoringSystem
-
-        # 初始化所有組件
-        twin = LithographyDigitalTwin("../uci-secom.csv")
-        coordinator = A2ACoordinator()
-        generator = ScenarioGenerator("../uci-secom.csv")
-        scorer = ScoringSystem()
+        # 取得所有組件（重複使用前面測試建立的實例）
+        twin = get_twin()
+        twin.reset()
+        coordinator = get_coordinator()
+        generator = get_generator()
+        scorer = get_scorer()
 
         print("✅ 所有組件初始化成功")
 
@@ -214,9 +237,7 @@ def test_integration():
         return True
 
     except Exception as e:
-        print(f"❌ 測試失敗: {e}")
-        import traceback
-        traceback.print_exc()
+        report_failure(e)
         return False
 
 def main():